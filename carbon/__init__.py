@@ -1,7 +1,376 @@
 """The main module for carbon."""
 
+import functools
+import hashlib
+import json
+import os
+from collections.abc import Iterable
 from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
 from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from carbon._intensity_cache import IntensityCache
+    from carbon.clusterconfig import ClusterConfig
+    from carbon.job import Job
+    from carbon.node import Node
 
 with suppress(PackageNotFoundError):
     __version__ = version(__name__)
+
+DEFAULT_INTENSITY = 137.0
+"""UK average carbon intensity in gCO2e/kWh, used when not fetching from the API."""
+
+ARRAY_JOB_MESSAGE = "Handling of array jobs not currently implemented"
+"""Explanation given when asked to analyse an array job."""
+
+_CONFIG_CACHE_VERSION = 5
+"""Version of the config parse cache, to be incremented when ClusterConfig changes."""
+
+
+def _load_config_cached(path: str) -> "ClusterConfig":
+    """Load a cluster configuration file, reusing a cached parse where possible.
+
+    The configuration is cached as JSON in the user's own cache directory, keyed on
+    the modification time and size of the file loaded and the version of the cache
+    format. When the cache is fresh the YAML parser and validation are bypassed, as
+    the cache holds a configuration that was validated when it was written. Failure
+    to read or write the cache is not an error; the YAML file is simply parsed as
+    normal. If a JSON version of the file compiled by `compile_yaml_to_json` is newer
+    than the YAML file, it is loaded instead.
+
+    Args:
+        path (str): Path to the cluster configuration YAML file.
+
+    Returns:
+        ClusterConfig: The parsed cluster configuration.
+    """
+    from carbon._atomic import write_atomic
+    from carbon.clusterconfig import ClusterConfig
+
+    # Prefer a JSON version of the config compiled by `compile_yaml_to_json`
+    source = Path(path)
+    stat = os.stat(source)
+    json_path = source.with_suffix(".json")
+    with suppress(OSError):
+        json_stat = os.stat(json_path)
+        if json_stat.st_mtime_ns >= stat.st_mtime_ns:
+            source, stat = json_path, json_stat
+
+    # Key the cache on the file that is actually loaded
+    key = [_CONFIG_CACHE_VERSION, source.suffix, stat.st_mtime_ns, stat.st_size]
+    digest = hashlib.sha256(os.fsencode(os.path.abspath(path))).hexdigest()
+    cache_path = _cache_dir() / "config" / f"{digest}.json"
+
+    with suppress(OSError, ValueError, TypeError, KeyError):
+        cached = json.loads(cache_path.read_bytes())
+        if cached["key"] == key:
+            return ClusterConfig.from_trusted_dict(cached["config"])
+
+    config = ClusterConfig.load(source)
+
+    with suppress(OSError):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cached = {"key": key, "config": config.model_dump(mode="json")}
+        write_atomic(json.dumps(cached).encode(), cache_path)
+
+    return config
+
+
+def _cache_dir() -> Path:
+    """Get the directory used for caches that persist between runs of carbon.
+
+    Returns:
+        Path: ``$XDG_CACHE_HOME/carbon``, defaulting to ``~/.cache/carbon``.
+    """
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "carbon"
+
+
+def _period_ended(bucket_iso: str) -> bool:
+    """Check whether a carbon intensity period is entirely in the past.
+
+    Args:
+        bucket_iso (str): Start of the period in ISO format, as returned by
+            `_intensity_bucket`.
+
+    Returns:
+        bool: True if the period has ended, so its carbon intensity is final.
+
+    >>> _period_ended("2025-07-09T12:30:00+00:00")
+    True
+    """
+    from carbon._period import PERIOD
+
+    start = datetime.fromisoformat(bucket_iso)
+    return start + PERIOD <= datetime.now(start.tzinfo)
+
+
+def _intensity_bucket(time: datetime) -> str:
+    """Round a time down to the start of its 30 minute carbon intensity period.
+
+    Args:
+        time (datetime): The time to round.
+
+    Returns:
+        str: The start of the enclosing period in ISO format.
+
+    >>> _intensity_bucket(datetime(2025, 7, 9, 12, 47, 13))
+    '2025-07-09T12:30:00'
+    """
+    from carbon._period import period_start
+
+    return period_start(time).isoformat()
+
+
+@functools.cache
+def _load_intensity_cache(path: Path) -> "IntensityCache":
+    """Get the carbon intensity cache persisted at a path, loading it on first use.
+
+    Args:
+        path (Path): Path to the JSON file the cache is persisted in.
+
+    Returns:
+        IntensityCache: The cache, shared by all callers in this process.
+    """
+    from carbon._intensity_cache import IntensityCache
+
+    cache = IntensityCache()
+    cache.load(path)
+    return cache
+
+
+def _cached_intensity(bucket_iso: str) -> float:
+    """Fetch the carbon intensity for a 30 minute period, memoized on disk.
+
+    See `_cached_intensities`.
+
+    Args:
+        bucket_iso (str): Start of the period in ISO format, as returned by
+            `_intensity_bucket`.
+
+    Returns:
+        float: The carbon intensity in gCO2/kWh.
+    """
+    return _cached_intensities([bucket_iso])[bucket_iso]
+
+
+def _cached_intensities(buckets: Iterable[str]) -> dict[str, float]:
+    """Fetch the carbon intensity for many 30 minute periods, memoized on disk.
+
+    Values are held in an `IntensityCache`, which is persisted as
+    ``intensity.json`` in the cache directory so that later invocations can reuse
+    them. Values for periods that have ended are kept until evicted, while forecasts
+    for current or future periods expire after 30 minutes. The periods not already
+    cached are fetched from the API concurrently. Failure to read or write the cache
+    file is not an error; the values are fetched from the API instead.
+
+    Args:
+        buckets (Iterable[str]): Start of each period in ISO format, as returned by
+            `_intensity_bucket`.
+
+    Returns:
+        dict[str, float]: The carbon intensity in gCO2/kWh of each period.
+    """
+    from carbon.intensity import CarbonIntensity
+
+    cache_path = _cache_dir() / "intensity.json"
+    cache = _load_intensity_cache(cache_path)
+    region_id = CarbonIntensity.REGIONID
+
+    intensities: dict[str, float] = {}
+    missing = []
+    for bucket in dict.fromkeys(buckets):
+        value = cache.get((region_id, bucket))
+        if value is None:
+            missing.append(bucket)
+        else:
+            intensities[bucket] = value
+
+    if not missing:
+        return intensities
+
+    fetched = CarbonIntensity.fetch_many([datetime.fromisoformat(b) for b in missing])
+    for bucket, value in zip(missing, fetched):
+        cache.put((region_id, bucket), value, final=_period_ended(bucket))
+        intensities[bucket] = value
+
+    with suppress(OSError):
+        cache.save(cache_path)
+
+    return intensities
+
+
+@dataclass(slots=True, frozen=True)
+class RunResult:
+    """The estimated energy consumption and carbon emissions of a compute job."""
+
+    job: "Job"
+    """The job analysed."""
+
+    node: "Node"
+    """The node the job was executed on."""
+
+    energy_consumed: float
+    """The energy consumed by the job in kilowatt-hours."""
+
+    carbon_intensity: float
+    """The carbon intensity at the job start time in gCO2e/kWh."""
+
+    emissions: float
+    """The estimated emissions of the job in gCO2e."""
+
+
+def _pbs_id(job_id: str) -> str:
+    """Convert a job ID to the form used to query the job scheduler.
+
+    Args:
+        job_id (str): The job identifier, optionally including a server suffix.
+
+    Returns:
+        str: The job identifier without its suffix.
+
+    Raises:
+        UnsupportedJobTypeError: If the job is an array job.
+
+    >>> _pbs_id("12345.pbs-7")
+    '12345'
+    """
+    from carbon.job import UnsupportedJobTypeError, is_array_job
+
+    if is_array_job(job_id):
+        raise UnsupportedJobTypeError(ARRAY_JOB_MESSAGE)
+
+    # Remove suffix to make IDs more uniform
+    id, _, _ = job_id.partition(".")
+    return id
+
+
+def run(
+    job_id: str, config: "ClusterConfig", default_intensity: bool = False
+) -> RunResult:
+    """Estimate the energy consumption and carbon emissions of a compute job.
+
+    Args:
+        job_id (str): The job identifier to analyze.
+        config (ClusterConfig): The configuration of the cluster the job ran on.
+        default_intensity (bool): If True, use `DEFAULT_INTENSITY` rather than
+            fetching the carbon intensity at the job start time. Otherwise, if the
+            cluster is configured to assume renewable electricity, the carbon
+            intensity is zero and is not fetched.
+
+    Returns:
+        RunResult: The estimated energy consumption and emissions of the job.
+
+    Raises:
+        UnsupportedJobTypeError: If the job is an array job.
+    """
+    from carbon.job import Job
+    from carbon.node import Node
+
+    if config.dummy_job:
+        # Use dummy job data for testing
+        job, node = config.build_dummy(job_id)
+    else:
+        # Fetch job data from the cluster's job scheduler
+        job = Job.fromPBS(_pbs_id(job_id))
+        node = Node.fromPBS(job.node, config.component_powers)
+
+    # Calculate energy consumption
+    energy_consumed = job.calculate_energy(node, config.pue)
+
+    # Fetch carbon intensity at job start time or use a default value
+    if default_intensity:
+        intensity = DEFAULT_INTENSITY
+    elif config.assume_renewable:
+        intensity = 0.0
+    else:
+        intensity = _cached_intensity(_intensity_bucket(job.starttime))
+
+    return RunResult(
+        job=job,
+        node=node,
+        energy_consumed=energy_consumed,
+        carbon_intensity=intensity,
+        emissions=intensity * energy_consumed,
+    )
+
+
+def run_many(
+    job_ids: Iterable[str], config: "ClusterConfig", default_intensity: bool = False
+) -> list[RunResult]:
+    """Estimate the energy consumption and carbon emissions of many compute jobs.
+
+    Equivalent to calling `run` for each job, but fetches all of the jobs from the job
+    scheduler at once, lists the hardware of all of their nodes at once and fetches
+    the carbon intensity of each 30 minute period only once, with the periods fetched
+    concurrently.
+
+    Args:
+        job_ids (Iterable[str]): The job identifiers to analyze.
+        config (ClusterConfig): The configuration of the cluster the jobs ran on.
+        default_intensity (bool): If True, use `DEFAULT_INTENSITY` rather than
+            fetching the carbon intensity at each job start time. Otherwise, if the
+            cluster is configured to assume renewable electricity, the carbon
+            intensity is zero and is not fetched.
+
+    Returns:
+        list[RunResult]: The estimated energy consumption and emissions of each job,
+            in the same order as `job_ids`.
+
+    Raises:
+        UnsupportedJobTypeError: If any job is an array job.
+    """
+    import numpy as np
+
+    from carbon.job import Job
+    from carbon.node import Node
+
+    if config.dummy_job:
+        # Use dummy job data for testing
+        pairs = [config.build_dummy(job_id) for job_id in job_ids]
+    else:
+        ids = [_pbs_id(job_id) for job_id in job_ids]
+        component_powers = config.component_powers
+        jobs = Job.fromPBS_many(ids)
+        labels = list({job.node for job in jobs})
+        nodes = dict(zip(labels, Node.fromPBS_many(labels, component_powers)))
+        pairs = [(job, nodes[job.node]) for job in jobs]
+
+    # Fetch carbon intensity once per period or use a default value
+    buckets = [_intensity_bucket(job.starttime) for job, _ in pairs]
+    if default_intensity:
+        intensities = dict.fromkeys(buckets, DEFAULT_INTENSITY)
+    elif config.assume_renewable:
+        intensities = dict.fromkeys(buckets, 0.0)
+    else:
+        intensities = _cached_intensities(buckets)
+
+    # Calculate energy consumption and emissions for the whole batch at once
+    energies = Job.calculate_energies(
+        [job for job, _ in pairs], [node for _, node in pairs], config.pue
+    )
+    carbon_intensities = np.fromiter(
+        (intensities[bucket] for bucket in buckets),
+        dtype=np.float64,
+        count=len(buckets),
+    )
+    emissions = carbon_intensities * energies
+
+    return [
+        RunResult(
+            job=job,
+            node=node,
+            energy_consumed=energy_consumed,
+            carbon_intensity=intensity,
+            emissions=job_emissions,
+        )
+        for (job, node), energy_consumed, intensity, job_emissions in zip(
+            pairs,
+            energies.tolist(),
+            carbon_intensities.tolist(),
+            emissions.tolist(),
+        )
+    ]
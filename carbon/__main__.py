@@ -5,8 +5,23 @@ compute job, optionally comparing the emissions to other activities such as trav
 food consumption.
 """
 
+import sys
+from pathlib import Path
+
 import click
 
+from carbon import ARRAY_JOB_MESSAGE, _load_config_cached, run
+from carbon.report import format_verbose
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+"""Directory holding the comparisons data files."""
+
+TRAVEL_PATH = DATA_DIR / "travel.csv"
+"""Path to the travel comparisons data."""
+
+FOOD_PATH = DATA_DIR / "food.csv"
+"""Path to the food comparisons data."""
+
 
 @click.command()
 @click.option("-v", "--verbose", is_flag=True, help="Enables verbose output")
@@ -44,15 +59,6 @@ def main(
     Returns:
         None
     """
-    import sys
-    from pathlib import Path
-
-    import yaml
-
-    from carbon.clusterconfig import ClusterConfig
-    from carbon.intensity import CarbonIntensity
-    from carbon.job import Job, JobStateError, MalformedJobIDError, UnknownJobIDError
-
     # Get cluster config file path from environment variable
     if not config_path:
         print(
@@ -63,99 +69,36 @@ def main(
         sys.exit(1)
 
     # Load the cluster configuration
-    with open(config_path) as f:
-        config_dict = yaml.safe_load(f)
-    config = ClusterConfig(**config_dict)
-
-    # Get the job data and node hardware info
-    from carbon.node import Node
-
-    if config.dummy_job:
-        # Use dummy job data for testing
-        dummy = config.dummy_job
-        job = Job(
-            job_id,
-            dummy.start_time,
-            dummy.run_time,
-            dummy.cpu_time,
-            dummy.ngpus,
-            dummy.memory_usage,
-            dummy.node,
-        )
-        node = Node(
-            name=dummy.node,
-            cpu_type=dummy.cpu_type,
-            gpu_type=dummy.gpu_type,
-            mem_type=dummy.mem_type,
-            per_core_power_watts=config.cpus[dummy.cpu_type]["per_core_power_watts"],
-            per_gpu_power_watts=config.gpus[dummy.gpu_type]["per_gpu_power_watts"]
-            if dummy.gpu_type
-            else 0.0,
-            per_gb_power_watts=config.memory[dummy.mem_type]["per_gb_power_watts"],
-        )
-    else:
-        # Remove suffix to make IDs more uniform
-        id = job_id.split(".")[0]
-
-        if id.endswith("[]"):
-            print("Error: Handling of array jobs not currently implemented.")
-            sys.exit()
-
-        # Fetch job data from the cluster's job scheduler
-        try:
-            job = Job.fromPBS(id)
-        except (UnknownJobIDError, MalformedJobIDError) as e:
-            print(f"Error: {e}. Please check the job ID.")
-            sys.exit()
-        except JobStateError as e:
-            print(f"Error: {e}")
-            sys.exit()
-        node = Node.fromPBS(
-            job.node,
-            {
-                "cpus": config.cpus,
-                "gpus": config.gpus,
-                "memory": config.memory,
-            },
-        )
+    config = _load_config_cached(config_path)
+
+    # Get the job data and node hardware info, and estimate its emissions
+    from carbon.job import (
+        JobStateError,
+        MalformedJobIDError,
+        UnknownJobIDError,
+        is_array_job,
+    )
 
-    # Calculate energy consumption
-    energy_consumed = job.calculate_energy(node, config.pue)
+    if not config.dummy_job and is_array_job(job_id):
+        print(f"Error: {ARRAY_JOB_MESSAGE}.")
+        sys.exit()
 
-    # Fetch carbon intensity at job start time or use a default value
-    if default_intensity:
-        intensity = 137.0
-    else:
-        carbon_intensity = CarbonIntensity(job.starttime)
-        intensity = carbon_intensity.fetch()
+    try:
+        result = run(job_id, config, default_intensity)
+    except (UnknownJobIDError, MalformedJobIDError) as e:
+        print(f"Error: {e}. Please check the job ID.")
+        sys.exit()
+    except JobStateError as e:
+        print(f"Error: {e}")
+        sys.exit()
 
-    # Calculate emissions
-    emissions = intensity * energy_consumed
+    job = result.job
+    energy_consumed = result.energy_consumed
+    intensity = result.carbon_intensity
+    emissions = result.emissions
 
     if verbose:
-        print(
-            f"Cluster information:"
-            f"\n    Name: {config.cluster_name}"
-            f"\n    PUE: {config.pue}"
-            f"\nNode information:"
-            f"\n    Name: {node.name}"
-            f"\n    CPU model: {node.cpu_type}"
-            f"\n    GPU model: {node.gpu_type}"
-            f"\n    Memory type: {node.mem_type}"
-            f"\n    CPU power draw (per core): {node.per_core_power_watts} W"
-            f"\n    GPU power draw (per GPU): {node.per_gpu_power_watts} W"
-            f"\n    Memory power draw (per GB): {node.per_gb_power_watts} W"
-            f"\nCalculation information:"
-            f"\n    Estimate is for scope 2 emissions only "
-            f"(i.e., indirect emissions due to purchased electricity)."
-            f"\n    Estimate is performed AS IF carbon intensity was London average at "
-            f"job start time, although electricity to Imperial's clusters is certified "
-            f"as 100% renewable."
-            f"\n    Estimates use the methodology of the Green Algorithms project by "
-            f"the Lannelongue group at the University of Cambridge "
-            f"(https://www.green-algorithms.org/, "
-            f"https://doi.org/10.1002/advs.202100707)"
-        )
+        print(format_verbose(result, config))
 
     gpuhours = job.ngpus * job.runtime
     memhours = job.memory * job.runtime
@@ -167,7 +110,10 @@ def main(
     )
     if default_intensity:
         print(f"Using UK average carbon intensity of {intensity} gCO2e/kWh")
-
+    elif config.assume_renewable:
+        print(
+            f"Assuming renewable electricity, carbon intensity is {intensity} gCO2e/kWh"
+        )
     else:
         print(f"Carbon intensity for {job.starttime} is {intensity} gCO2e/kWh")
     print(f"Estimated emissions is {round(emissions)} gCO2e")
@@ -176,9 +122,6 @@ def main(
     if compare:
         from carbon.comparisons import Food, Travel
 
-        TRAVEL_PATH = Path(__file__).parent / "data" / "travel.csv"
-        FOOD_PATH = Path(__file__).parent / "data" / "food.csv"
-
         if not TRAVEL_PATH.exists():
             print(
                 f"Error: Missing comparisons data file at {TRAVEL_PATH}. "
@@ -187,7 +130,7 @@ def main(
             )
         else:
             print("----- Travel Comparisons -----")
-            travel_comparer = Travel(TRAVEL_PATH)
+            travel_comparer = Travel.from_path(TRAVEL_PATH)
             travel_comparer.print_comparisons(emissions)
 
         if not FOOD_PATH.exists():
@@ -198,7 +141,7 @@ def main(
             )
         else:
             print("----- Food Comparisons -----")
-            food_comparer = Food(FOOD_PATH)
+            food_comparer = Food.from_path(FOOD_PATH)
             food_comparer.print_comparisons(emissions)
 
 
@@ -0,0 +1,25 @@
+"""Atomic replacement of files that may be read by concurrent runs of carbon."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(data: bytes, path: Path) -> None:
+    """Atomically replace a file with the given contents.
+
+    The data is written to a temporary file in the same directory first, then moved
+    into place, so that concurrent readers never see a partially written file.
+
+    Args:
+        data (bytes): The new contents of the file.
+        path (Path): The path of the file to replace.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,112 @@
+"""A cache of carbon intensity values, held in memory and persisted as JSON.
+
+Carbon intensity for a period that has ended does not change, so those values are
+kept until evicted. Values for current or future periods are only forecasts, so they
+expire after 30 minutes, matching how often the forecasts are updated.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+
+from carbon._atomic import write_atomic
+
+MAX_ENTRIES = 4096
+"""Maximum number of values held, beyond which the least recently used are evicted."""
+
+FORECAST_TTL = 30 * 60
+"""Time in seconds for which the forecast intensity of a period is kept."""
+
+CacheKey = tuple[int, str]
+"""Cache key of a region ID and the start of a period in ISO format."""
+
+
+class IntensityCache:
+    """A least recently used cache of carbon intensity values, with expiry.
+
+    Args:
+        max_entries (int): Maximum number of values to hold.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of values to hold.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, tuple[float, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of values held, including any that have expired."""
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> float | None:
+        """Get a cached carbon intensity, marking it as recently used.
+
+        Args:
+            key (CacheKey): The region ID and start of the period.
+
+        Returns:
+            float | None: The carbon intensity in gCO2/kWh, or None if it is not
+                cached or has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expiry = entry
+        if expiry is not None and expiry <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: CacheKey, value: float, final: bool) -> None:
+        """Cache a carbon intensity, evicting the least recently used if full.
+
+        Args:
+            key (CacheKey): The region ID and start of the period.
+            value (float): The carbon intensity in gCO2/kWh.
+            final (bool): Whether the period has ended, so the value never expires.
+        """
+        self._entries[key] = (value, None if final else time.time() + FORECAST_TTL)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self, path: Path) -> None:
+        """Add the unexpired values saved in a JSON file by `save` to the cache.
+
+        A missing or malformed file is not an error, and is treated as empty.
+
+        Args:
+            path (Path): Path to the JSON file.
+        """
+        with suppress(OSError, ValueError, TypeError):
+            entries = json.loads(path.read_bytes())
+            now = time.time()
+            for region_id, start, value, expiry in entries:
+                if expiry is None or expiry > now:
+                    key = (int(region_id), str(start))
+                    expiry = None if expiry is None else float(expiry)
+                    self._entries[key] = (float(value), expiry)
+                    self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self, path: Path) -> None:
+        """Atomically write the cached values to a JSON file.
+
+        Args:
+            path (Path): Path to the JSON file.
+        """
+        entries = [
+            [region_id, start, value, expiry]
+            for (region_id, start), (value, expiry) in self._entries.items()
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(json.dumps(entries).encode(), path)
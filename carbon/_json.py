@@ -0,0 +1,18 @@
+"""JSON parsing with orjson when it is installed, or the standard library otherwise.
+
+Import this module only where JSON is parsed, so that orjson is not imported on
+paths that never need it.
+"""
+
+import json
+from importlib.util import find_spec
+
+HAVE_ORJSON = find_spec("orjson") is not None
+"""Whether orjson is available to parse JSON from the job scheduler and the API."""
+
+if HAVE_ORJSON:
+    import orjson
+
+    loads = orjson.loads
+else:
+    loads = json.loads
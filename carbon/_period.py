@@ -0,0 +1,25 @@
+"""The 30 minute periods the carbon intensity is reported for.
+
+Kept apart from the intensity module so that callers which only need to round times
+to a period do not import requests.
+"""
+
+from datetime import datetime, timedelta
+
+PERIOD = timedelta(minutes=30)
+"""Length of the periods the carbon intensity is reported for."""
+
+
+def period_start(time: datetime) -> datetime:
+    """Round a time down to the start of its 30 minute carbon intensity period.
+
+    Args:
+        time (datetime): The time to round.
+
+    Returns:
+        datetime: The start of the enclosing period.
+
+    >>> period_start(datetime(2025, 8, 21, 12, 47, 13))
+    datetime.datetime(2025, 8, 21, 12, 30)
+    """
+    return time.replace(minute=30 * (time.minute // 30), second=0, microsecond=0)
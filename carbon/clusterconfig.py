@@ -1,8 +1,56 @@
 """Configuration schema for an HPC cluster and its power usage characteristics."""
 
+from collections.abc import Mapping
 from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Self
 
-from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt, PositiveFloat
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveFloat,
+    field_validator,
+)
+from pydantic.dataclasses import dataclass
+
+from carbon.job import Job
+from carbon.node import Node
+
+
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra="forbid"))
+class CPUConfig:
+    """Power usage characteristics of a type of CPU.
+
+    Attributes:
+        per_core_power_watts (float): Power usage per CPU core in watts.
+    """
+
+    per_core_power_watts: NonNegativeFloat
+
+
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra="forbid"))
+class GPUConfig:
+    """Power usage characteristics of a type of GPU.
+
+    Attributes:
+        per_gpu_power_watts (float): Power usage per GPU in watts.
+    """
+
+    per_gpu_power_watts: NonNegativeFloat
+
+
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra="forbid"))
+class MemoryConfig:
+    """Power usage characteristics of a type of memory.
+
+    Attributes:
+        per_gb_power_watts (float): Power usage per GB of memory in watts.
+    """
+
+    per_gb_power_watts: NonNegativeFloat
 
 
 class DummyJob(BaseModel):
@@ -30,6 +78,18 @@ class DummyJob(BaseModel):
     gpu_type: str | None = None
     mem_type: str
 
+    @field_validator("start_time", mode="before")
+    @classmethod
+    def _parse_iso_start_time(cls, value: object) -> object:
+        """Parse ISO format start times directly, rather than by generic coercion."""
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+    @field_validator("gpu_type")
+    @classmethod
+    def _empty_gpu_type_is_none(cls, value: str | None) -> str | None:
+        """Treat an empty GPU type as no GPU, as for nodes without one."""
+        return value or None
+
 
 class ClusterConfig(BaseModel):
     """Configuration for an HPC cluster and hosting data center.
@@ -37,15 +97,268 @@ class ClusterConfig(BaseModel):
     Attributes:
         cluster_name (str): Name of the HPC cluster.
         pue (float): Power Usage Effectiveness of the data center.
-        cpus (dict): Dictionary of CPU types and their power usage.
-        gpus (dict): Dictionary of GPU types and their power usage.
-        memory (dict): Dictionary with memory types and their power usage.
+        cpus (dict[str, CPUConfig]): Dictionary of CPU types and their power usage.
+        gpus (dict[str, GPUConfig]): Dictionary of GPU types and their power usage.
+        memory (dict[str, MemoryConfig]): Dictionary with memory types and their
+            power usage.
         dummy_job (DummyJob | None): Optional dummy job specification.
+        assume_renewable (bool): If True, electricity is assumed to be from renewable
+            sources, with zero carbon intensity, instead of fetching the carbon
+            intensity of the grid.
     """
 
+    # Frozen, so the power tables cached from the fields can never go stale
+    model_config = ConfigDict(frozen=True)
+
     cluster_name: str
     pue: PositiveFloat
-    cpus: dict[str, dict[str, float]]
-    gpus: dict[str, dict[str, float]]
-    memory: dict[str, dict[str, float]]
+    cpus: dict[str, CPUConfig]
+    gpus: dict[str, GPUConfig]
+    memory: dict[str, MemoryConfig]
     dummy_job: DummyJob | None = None
+    assume_renewable: bool = False
+
+    def model_copy(
+        self, *, update: Mapping[str, object] | None = None, deep: bool = False
+    ) -> Self:
+        """Copy the configuration, recomputing cached values if fields are updated.
+
+        Args:
+            update (Mapping[str, object] | None): Values to change in the copy.
+            deep (bool): Whether to make a deep copy.
+
+        Returns:
+            ClusterConfig: The copied configuration.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            for name, attribute in vars(ClusterConfig).items():
+                if isinstance(attribute, cached_property):
+                    copied.__dict__.pop(name, None)
+        return copied
+
+    @classmethod
+    def from_trusted_dict(cls, data: Mapping[str, object]) -> "ClusterConfig":
+        """Create a cluster configuration from already validated data.
+
+        Validation of the configuration and its dummy job is skipped, so this must
+        only be used with data produced by `model_dump` of a validated configuration,
+        such as the user's own cached copy. Use `model_validate` for anything else.
+
+        Args:
+            data (Mapping[str, object]): The configuration data, in Python or JSON
+                mode.
+
+        Returns:
+            ClusterConfig: The cluster configuration.
+        """
+        fields = dict(data)
+        for key, component in (
+            ("cpus", CPUConfig),
+            ("gpus", GPUConfig),
+            ("memory", MemoryConfig),
+        ):
+            components = fields.get(key)
+            if isinstance(components, dict):
+                fields[key] = {
+                    name: component(**values) for name, values in components.items()
+                }
+        dummy_job = fields.get("dummy_job")
+        if isinstance(dummy_job, dict):
+            start_time = dummy_job.get("start_time")
+            if isinstance(start_time, str):
+                dummy_job = dummy_job | {
+                    "start_time": datetime.fromisoformat(start_time)
+                }
+            fields["dummy_job"] = DummyJob.model_construct(**dummy_job)
+        return cls.model_construct(**fields)  # type: ignore[arg-type]
+
+    @classmethod
+    def from_yaml(cls, path: Path) -> Self:
+        """Load a cluster configuration from a YAML file.
+
+        The libyaml based loader is used when PyYAML has been built with it.
+
+        Args:
+            path (Path): Path to the YAML file.
+
+        Returns:
+            ClusterConfig: The validated cluster configuration.
+        """
+        import yaml
+
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:
+            from yaml import SafeLoader  # type: ignore[assignment]
+
+        with open(path, "rb") as f:
+            return cls.model_validate(yaml.load(f, Loader=SafeLoader))
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Load a cluster configuration from a JSON or YAML file.
+
+        JSON files, such as those written by `compile_yaml_to_json`, are validated
+        directly from their raw bytes with `model_validate_json`. Any other file is
+        parsed as YAML.
+
+        Args:
+            path (Path): Path to the configuration file.
+
+        Returns:
+            ClusterConfig: The validated cluster configuration.
+        """
+        if path.suffix.lower() == ".json":
+            return cls.model_validate_json(path.read_bytes())
+        return cls.from_yaml(path)
+
+    @cached_property
+    def component_powers(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Power usage of each component type, in the form taken by `Node.fromPBS`."""
+        return self.model_dump(include={"cpus", "gpus", "memory"})
+
+    @cached_property
+    def _cpu_powers(self) -> dict[str, float]:
+        """Power usage per CPU core in watts, by CPU type."""
+        return {k: v.per_core_power_watts for k, v in self.cpus.items()}
+
+    @cached_property
+    def _gpu_powers(self) -> dict[str | None, float]:
+        """Power usage per GPU in watts, by GPU type, including zero for no GPU."""
+        powers: dict[str | None, float] = {None: 0.0}
+        powers.update((k, v.per_gpu_power_watts) for k, v in self.gpus.items())
+        return powers
+
+    @cached_property
+    def _mem_powers(self) -> dict[str, float]:
+        """Power usage per GB of memory in watts, by memory type."""
+        return {k: v.per_gb_power_watts for k, v in self.memory.items()}
+
+    def cpu_power(self, cpu_type: str) -> float:
+        """Get the power usage per core of a type of CPU.
+
+        Args:
+            cpu_type (str): The CPU model.
+
+        Returns:
+            float: Power usage per CPU core in watts.
+
+        Raises:
+            ValueError: If the CPU type is not in the config.
+        """
+        try:
+            return self._cpu_powers[cpu_type]
+        except KeyError:
+            raise ValueError(f"CPU type '{cpu_type}' not found in cluster config.")
+
+    def gpu_power(self, gpu_type: str | None) -> float:
+        """Get the power usage of a type of GPU.
+
+        Args:
+            gpu_type (str | None): The GPU model, or None (or empty) if GPU not
+                present.
+
+        Returns:
+            float: Power usage per GPU in watts. Zero if GPU not present.
+
+        Raises:
+            ValueError: If the GPU type is not in the config.
+        """
+        try:
+            return self._gpu_powers[gpu_type or None]
+        except KeyError:
+            raise ValueError(f"GPU type '{gpu_type}' not found in cluster config.")
+
+    def mem_power(self, mem_type: str) -> float:
+        """Get the power usage per GB of a type of memory.
+
+        Args:
+            mem_type (str): The memory type.
+
+        Returns:
+            float: Power usage per GB of memory in watts.
+
+        Raises:
+            ValueError: If the memory type is not in the config.
+        """
+        try:
+            return self._mem_powers[mem_type]
+        except KeyError:
+            raise ValueError(f"Memory type '{mem_type}' not found in cluster config.")
+
+    @cached_property
+    def dummy_node(self) -> Node:
+        """The node the dummy job was executed on.
+
+        Raises:
+            ValueError: If no dummy job is configured.
+        """
+        if self.dummy_job is None:
+            raise ValueError(f"No dummy job configured for {self.cluster_name}")
+
+        dummy = self.dummy_job
+        return Node(
+            name=dummy.node,
+            cpu_type=dummy.cpu_type,
+            gpu_type=dummy.gpu_type,
+            mem_type=dummy.mem_type,
+            per_core_power_watts=self.cpu_power(dummy.cpu_type),
+            per_gpu_power_watts=self.gpu_power(dummy.gpu_type),
+            per_gb_power_watts=self.mem_power(dummy.mem_type),
+        )
+
+    def build_dummy(self, job_id: str) -> tuple[Job, Node]:
+        """Build the dummy job and the node it was executed on.
+
+        Args:
+            job_id (str): The identifier to give the dummy job.
+
+        Returns:
+            tuple[Job, Node]: The dummy job and its node.
+
+        Raises:
+            ValueError: If no dummy job is configured.
+        """
+        if self.dummy_job is None:
+            raise ValueError(f"No dummy job configured for {self.cluster_name}")
+
+        dummy = self.dummy_job
+        job = Job(
+            job_id,
+            dummy.start_time,
+            dummy.run_time,
+            dummy.cpu_time,
+            dummy.ngpus,
+            dummy.memory_usage,
+            dummy.node,
+        )
+        return job, self.dummy_node
+
+
+def compile_yaml_to_json(src: Path, dst: Path | None = None) -> Path:
+    """Convert a YAML cluster configuration file to JSON.
+
+    The JSON form is validated without going through the YAML parser, so is much
+    faster to load. It is preferred over the YAML file it was compiled from while it is
+    the newer of the two.
+
+    Args:
+        src (Path): Path to the YAML file.
+        dst (Path | None): Path to write the JSON file to. Defaults to `src` with a
+            ``.json`` suffix.
+
+    Returns:
+        Path: The path the JSON file was written to.
+    """
+    if dst is None:
+        dst = src.with_suffix(".json")
+    dst.write_text(ClusterConfig.from_yaml(src).model_dump_json(indent=4) + "\n")
+    return dst
+
+
+if __name__ == "__main__":
+    import sys
+
+    for src in sys.argv[1:]:
+        print(f"Wrote {compile_yaml_to_json(Path(src))}")
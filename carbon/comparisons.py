@@ -1,133 +1,280 @@
 """Module for comparing compute job emissions to other sources."""
 
 import csv
-from abc import ABC, abstractmethod
+import functools
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import suppress
 from pathlib import Path
+from typing import NamedTuple, Self
 
+import numpy as np
+import numpy.typing as npt
 
-class EmissionsComparison(ABC):
-    """Abstract base class for comparing compute job emissions to other sources.
+from carbon import _cache_dir
+
+_CACHE_VERSION = 3
+"""Version of the comparison data cache, to be incremented when its format changes."""
+
+
+class ComparisonDataError(ValueError):
+    """Raised for comparison data files without the expected columns."""
+
+    pass
+
+
+class ComparisonData(NamedTuple):
+    """Comparison data loaded from a CSV file, stored as parallel columns."""
+
+    labels: tuple[str, ...]
+    """The name of each item."""
+
+    per_gco2e: npt.NDArray[np.float64]
+    """The amount of each item, in its display unit, that emits one gCO2e."""
+
+    units: tuple[str, ...]
+    """The unit or note to display alongside each item."""
+
+
+@functools.cache
+def _load_csv(
+    path: Path,
+    label_column: str,
+    emissions_column: str,
+    units_per_reference_column: str | None,
+    unit_column: str,
+) -> ComparisonData:
+    """Load comparison data from a CSV file, memoized for the life of the process.
+
+    The header is checked for the required columns once, then rows with missing or
+    non-numeric values are skipped. The returned per_gco2e array is read-only, as it is
+    shared between every caller loading the same file.
+
+    Args:
+        path (Path): Path to the CSV file containing comparison data.
+        label_column (str): Column holding the name of each item.
+        emissions_column (str): Column holding the emissions in gCO2e of a reference
+            quantity of each item.
+        units_per_reference_column (str | None): Column holding the number of display
+            units in the reference quantity, if any.
+        unit_column (str): Column holding the unit or note to display with each item.
+
+    Returns:
+        ComparisonData: The name, amount per gCO2e and unit of each item.
+
+    Raises:
+        ComparisonDataError: If the file does not have all of the required columns.
+    """
+    labels = []
+    per_gco2e = []
+    units = []
+    with open(path, newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        required = [label_column, emissions_column, unit_column]
+        if units_per_reference_column is not None:
+            required.append(units_per_reference_column)
+        if missing := [column for column in required if column not in header]:
+            raise ComparisonDataError(
+                f"Comparison data file '{path}' is missing columns {missing}."
+            )
+
+        # Resolve the position of each column once, rather than on every row
+        label_i = header.index(label_column)
+        emissions_i = header.index(emissions_column)
+        unit_i = header.index(unit_column)
+        per_reference_i = (
+            None
+            if units_per_reference_column is None
+            else header.index(units_per_reference_column)
+        )
+        width = len(header)
+
+        for row in reader:
+            if len(row) < width:
+                continue
+            # Store the reciprocal of the emissions, so comparing is a multiplication
+            try:
+                amount = 1.0 / float(row[emissions_i])
+                if per_reference_i is not None:
+                    amount *= float(row[per_reference_i])
+            except (ValueError, ZeroDivisionError):
+                continue
+            labels.append(row[label_i])
+            per_gco2e.append(amount)
+            units.append(row[unit_i])
+
+    per_gco2e_array = np.array(per_gco2e, dtype=np.float64)
+    per_gco2e_array.flags.writeable = False
+    return ComparisonData(tuple(labels), per_gco2e_array, tuple(units))
+
+
+class EmissionsComparison:
+    """Base class for comparing compute job emissions to other sources.
+
+    Subclasses only declare the CSV columns holding the name of each item, its
+    emissions and the unit or note to display with it, and how to format each
+    comparison; the loading, calculation and printing are shared.
 
     Args:
         data_path (Path): Path to the CSV file containing comparison data.
     """
 
-    def __init__(self, data_path: Path) -> None:
+    _LABEL_COLUMN: str
+    """Column holding the name of each item."""
+
+    _EMISSIONS_COLUMN: str
+    """Column holding the emissions in gCO2e of a reference quantity of each item."""
+
+    _UNITS_PER_REFERENCE_COLUMN: str | None = None
+    """Column holding the number of display units in the reference quantity, if any."""
+
+    _UNIT_COLUMN: str
+    """Column holding the unit or note to display alongside each item."""
+
+    _FORMAT: str
+    """Template for printing a comparison, with ``name``, ``amount`` and ``unit``."""
+
+    _FORMAT_WITHOUT_UNIT: str | None = None
+    """Template for printing a comparison with an empty unit, if not `_FORMAT`."""
+
+    def __init__(
+        self, data_path: Path, comparisons: ComparisonData | None = None
+    ) -> None:
         """Initialize the EmissionsComparison object and load comparison data from CSV.
 
         Args:
             data_path (Path): Path to the CSV file containing comparison data.
+            comparisons (ComparisonData | None): Comparison data already loaded from
+                `data_path`. If None, the CSV file is read.
         """
         self.data_path = data_path
-        self.comparisons = self._load_comparisons()
+        self.comparisons = (
+            self._load_comparisons() if comparisons is None else comparisons
+        )
 
-    def _load_comparisons(self) -> list[dict[str, str]]:
-        """Load comparison data from a CSV file.
+    @classmethod
+    def from_path(cls, data_path: Path) -> Self:
+        """Create an EmissionsComparison, reusing a cached copy of the CSV data.
 
-        Returns:
-            list[dict[str, str]]: List of dictionaries, each representing a row from the
-                CSV file.
-        """
-        comparisons = []
-        with open(self.data_path, newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                comparisons.append(row)
-        return comparisons
-
-    @abstractmethod
-    def get_equivalents(self, emissions_gco2: float) -> list[tuple[str, float, str]]:
-        """Calculates the amount of each item that would emit the same emissions.
+        The loaded comparison data is cached as JSON in the user's own cache
+        directory, keyed on the modification time and size of the CSV file and the
+        version of the cache format. Failure to read or write the cache is not an
+        error; the CSV file is simply read as normal.
 
         Args:
-            emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
-                against.
+            data_path (Path): Path to the CSV file containing comparison data.
 
         Returns:
-            list[tuple[str, float, str]]: List of (item, amount, unit/note) tuples.
-        """
-        pass
-
-    @abstractmethod
-    def print_comparisons(self, emissions_gco2: float) -> None:
-        """Print the equivalent of each item for the given emissions.
-
-        Args:
-            emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
-                against.
+            EmissionsComparison: An instance with the comparison data loaded.
         """
-        pass
+        from carbon._atomic import write_atomic
 
+        stat = data_path.stat()
+        key = [_CACHE_VERSION, cls.__name__, stat.st_mtime_ns, stat.st_size]
+        digest = hashlib.sha256(os.fsencode(data_path.absolute())).hexdigest()
+        cache_path = _cache_dir() / "comparisons" / f"{digest}.json"
 
-class Travel(EmissionsComparison):
-    """Compares emissions to travel methods using reference data."""
+        with suppress(OSError, ValueError, TypeError, KeyError):
+            cached = json.loads(cache_path.read_bytes())
+            labels, per_gco2e, units = cached["comparisons"]
+            if cached["key"] == key and len(labels) == len(per_gco2e) == len(units):
+                per_gco2e_array = np.array(per_gco2e, dtype=np.float64)
+                per_gco2e_array.flags.writeable = False
+                comparisons = ComparisonData(
+                    tuple(labels), per_gco2e_array, tuple(units)
+                )
+                return cls(data_path, comparisons)
 
-    def get_equivalents(self, emissions_gco2: float) -> list[tuple[str, float, str]]:
-        """Calculates the distance via each method that would emit the same emissions.
+        comparer = cls(data_path)
+        with suppress(OSError):
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            labels, per_gco2e, units = comparer.comparisons
+            cached = {"key": key, "comparisons": [labels, per_gco2e.tolist(), units]}
+            write_atomic(json.dumps(cached).encode(), cache_path)
+        return comparer
 
-        Args:
-            emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
-                against.
+    def _load_comparisons(self) -> ComparisonData:
+        """Load comparison data from a CSV file.
 
         Returns:
-            list[tuple[str, float, str]]: List of (method, kilometers, note) tuples.
+            ComparisonData: The name, amount per gCO2e and unit of each item.
         """
-        results = []
-        for comp in self.comparisons:
-            try:
-                kilometers = emissions_gco2 / float(comp["gCO2ePerKm"])
-                results.append((comp["Method"], kilometers, comp["Note"]))
-            except (KeyError, ValueError):
-                continue
-        return results
+        return _load_csv(
+            self.data_path,
+            self._LABEL_COLUMN,
+            self._EMISSIONS_COLUMN,
+            self._UNITS_PER_REFERENCE_COLUMN,
+            self._UNIT_COLUMN,
+        )
 
-    def print_comparisons(self, emissions_gco2: float) -> None:
-        """Print the equivalent travel distances for the given emissions.
+    def iter_equivalents(
+        self, emissions_gco2: float
+    ) -> Iterator[tuple[str, float, str]]:
+        """Iterate over the amount of each item that would emit the same emissions.
 
         Args:
             emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
                 against.
-        """
-        equivalents = self.get_equivalents(emissions_gco2)
-        print("Equivalent to:")
-        for method, kilometers, note in equivalents:
-            print(f"    {method} {kilometers:.1f} km {note}")
 
-
-class Food(EmissionsComparison):
-    """Compares emissions to food data using reference data."""
+        Returns:
+            Iterator[tuple[str, float, str]]: Iterator of (item, amount, unit/note)
+                tuples.
+        """
+        labels, per_gco2e, units = self.comparisons
+        amounts: list[float] = (emissions_gco2 * per_gco2e).tolist()
+        return zip(labels, amounts, units)
 
     def get_equivalents(self, emissions_gco2: float) -> list[tuple[str, float, str]]:
-        """Calculate the number of portions that would emit the same emissions.
+        """Calculates the amount of each item that would emit the same emissions.
 
         Args:
             emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
                 against.
 
         Returns:
-            list[tuple[str, float, str]]: List of (food, portions, portion_name) tuples.
+            list[tuple[str, float, str]]: List of (item, amount, unit/note) tuples.
         """
-        results = []
-        for comp in self.comparisons:
-            try:
-                kilos = emissions_gco2 / float(comp["gCO2ePerKilo"])
-                portions = kilos * float(comp["PortionPerKilo"])
-                results.append((comp["Food"], portions, comp["PluralPortionName"]))
-            except (KeyError, ValueError):
-                continue
-        return results
+        return list(self.iter_equivalents(emissions_gco2))
 
     def print_comparisons(self, emissions_gco2: float) -> None:
-        """Print the equivalent food portions for the given emissions.
+        """Print the equivalent of each item for the given emissions.
 
         Args:
             emissions_gco2 (float): The emissions in grams of CO2 equivalent to compare
                 against.
         """
-        equivalents = self.get_equivalents(emissions_gco2)
-        print("Equivalent to:")
-        for food, portions, portion_name in equivalents:
-            if portion_name:
-                print(f"    {portions:.1f} {portion_name} of {food}")
-            else:
-                print(f"    {portions:.1f} {food}")
+        fmt = self._FORMAT
+        fmt_without_unit = self._FORMAT_WITHOUT_UNIT or fmt
+        lines = ["Equivalent to:"]
+        lines.extend(
+            (fmt if unit else fmt_without_unit).format(
+                name=name, amount=amount, unit=unit
+            )
+            for name, amount, unit in self.iter_equivalents(emissions_gco2)
+        )
+        # Write all lines at once, rather than a print call for each
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+class Travel(EmissionsComparison):
+    """Compares emissions to travel methods using reference data."""
+
+    _LABEL_COLUMN = "Method"
+    _EMISSIONS_COLUMN = "gCO2ePerKm"
+    _UNIT_COLUMN = "Note"
+    _FORMAT = "    {name} {amount:.1f} km {unit}"
+
+
+class Food(EmissionsComparison):
+    """Compares emissions to food data using reference data."""
+
+    _LABEL_COLUMN = "Food"
+    _EMISSIONS_COLUMN = "gCO2ePerKilo"
+    _UNITS_PER_REFERENCE_COLUMN = "PortionPerKilo"
+    _UNIT_COLUMN = "PluralPortionName"
+    _FORMAT = "    {amount:.1f} {unit} of {name}"
+    _FORMAT_WITHOUT_UNIT = "    {amount:.1f} {name}"
@@ -0,0 +1,136 @@
+"""The energy module.
+
+This module provides functionality for calculating the electrical energy consumed by
+many compute jobs at once. The calculation is a NumPy array expression, except for
+very large batches when Numba is installed, for which it is compiled into a single
+parallel loop.
+"""
+
+from importlib.util import find_spec
+
+import numpy as np
+import numpy.typing as npt
+
+HAVE_NUMBA = find_spec("numba") is not None
+"""Whether Numba is available to compile the parallel energy kernel."""
+
+_PARALLEL_MIN_JOBS = 10_000
+"""Minimum number of jobs for which the parallel kernel is used, if available."""
+
+if HAVE_NUMBA:
+    from numba import njit, prange
+else:
+    prange = range  # type: ignore[misc]
+
+
+def _energy_kernel(
+    cputime: npt.NDArray[np.float64],
+    runtime: npt.NDArray[np.float64],
+    memory: npt.NDArray[np.float64],
+    ngpus: npt.NDArray[np.float64],
+    per_core_kw: npt.NDArray[np.float64],
+    per_gpu_kw: npt.NDArray[np.float64],
+    per_gb_kw: npt.NDArray[np.float64],
+    pue: float,
+) -> npt.NDArray[np.float64]:
+    """Calculate the energy consumed by each job in kilowatt-hours.
+
+    See `calculate_energies` for a description of the arguments.
+    """
+    return (
+        per_core_kw * cputime
+        + per_gpu_kw * ngpus * runtime
+        + per_gb_kw * memory * runtime
+    ) * pue
+
+
+def _energy_kernel_parallel(
+    cputime: npt.NDArray[np.float64],
+    runtime: npt.NDArray[np.float64],
+    memory: npt.NDArray[np.float64],
+    ngpus: npt.NDArray[np.float64],
+    per_core_kw: npt.NDArray[np.float64],
+    per_gpu_kw: npt.NDArray[np.float64],
+    per_gb_kw: npt.NDArray[np.float64],
+    pue: float,
+    out: npt.NDArray[np.float64],
+) -> None:
+    """Calculate the energy consumed by each job in kilowatt-hours into `out`.
+
+    Unlike `_energy_kernel`, no intermediate arrays are allocated, as the whole
+    expression is evaluated in a single pass over the jobs. When compiled with Numba,
+    the jobs are split between threads.
+
+    See `calculate_energies` for a description of the other arguments.
+    """
+    for i in prange(out.shape[0]):
+        out[i] = (
+            per_core_kw[i] * cputime[i]
+            + per_gpu_kw[i] * ngpus[i] * runtime[i]
+            + per_gb_kw[i] * memory[i] * runtime[i]
+        ) * pue
+
+
+if HAVE_NUMBA:
+    _energy_kernel_parallel = njit(cache=True, fastmath=True, parallel=True)(
+        _energy_kernel_parallel
+    )
+
+
+def calculate_energies(
+    cputime: npt.ArrayLike,
+    runtime: npt.ArrayLike,
+    memory: npt.ArrayLike,
+    ngpus: npt.ArrayLike,
+    per_core_kw: npt.ArrayLike,
+    per_gpu_kw: npt.ArrayLike,
+    per_gb_kw: npt.ArrayLike,
+    pue: float,
+) -> npt.NDArray[np.float64]:
+    """Calculate energy consumption in kilowatt-hours for many compute jobs.
+
+    Each array holds one value per job, so jobs may have run on different nodes.
+
+    Args:
+        cputime (ArrayLike): CPU time used by each job in core-hours.
+        runtime (ArrayLike): Runtime of each job in hours.
+        memory (ArrayLike): Memory allocated to each job in GB.
+        ngpus (ArrayLike): Number of GPUs used by each job.
+        per_core_kw (ArrayLike): Power usage per CPU core of each job's node in
+            kilowatts.
+        per_gpu_kw (ArrayLike): Power usage per GPU of each job's node in kilowatts.
+        per_gb_kw (ArrayLike): Power usage per GB of memory of each job's node in
+            kilowatts.
+        pue (float): Power Usage Effectiveness of the data center.
+
+    Returns:
+        NDArray[float64]: The energy consumed by each job in kilowatt-hours.
+
+    Raises:
+        ValueError: If the arrays do not all have the same shape.
+
+    >>> calculate_energies([2.0], [2.0], [16.0], [1], [0.01], [0.2], [0.002], 1.5)
+    array([0.726])
+    """
+    arrays = (
+        np.ascontiguousarray(cputime, dtype=np.float64),
+        np.ascontiguousarray(runtime, dtype=np.float64),
+        np.ascontiguousarray(memory, dtype=np.float64),
+        np.ascontiguousarray(ngpus, dtype=np.float64),
+        np.ascontiguousarray(per_core_kw, dtype=np.float64),
+        np.ascontiguousarray(per_gpu_kw, dtype=np.float64),
+        np.ascontiguousarray(per_gb_kw, dtype=np.float64),
+    )
+    # The parallel kernel does not check bounds, so it must be given equal lengths
+    if any(array.shape != arrays[0].shape for array in arrays[1:]):
+        raise ValueError(
+            "Expected one value per job in every array, got arrays of shapes "
+            f"{[array.shape for array in arrays]}."
+        )
+
+    if not HAVE_NUMBA or arrays[0].shape[0] < _PARALLEL_MIN_JOBS:
+        return _energy_kernel(*arrays, pue)
+
+    out = np.empty_like(arrays[0])
+    _energy_kernel_parallel(*arrays, pue, out)
+    return out
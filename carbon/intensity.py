@@ -5,9 +5,51 @@ Data is fetched from the Carbon Intensity API (carbonintensity.org.uk) based on
 specified region and time period.
 """
 
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from carbon._json import loads as _loads_json
+from carbon._period import PERIOD as _PERIOD
+from carbon._period import period_start as _period_start
+
+_TIMEOUT = (3.05, 10)
+"""Connect and read timeouts in seconds for requests to the API."""
+
+_FETCH_WORKERS = 8
+"""Maximum number of concurrent requests to the API in `CarbonIntensity.fetch_many`."""
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%MZ"
+"""Format of the times in API URLs and responses."""
+
+_MAX_RANGE = timedelta(days=14)
+"""Longest time range the API returns in a single request."""
+
+_MAX_GAP = timedelta(days=1)
+"""Longest gap between wanted periods that are fetched in the same request."""
+
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False,
+)
+"""Policy for retrying failed requests to the API, with exponential backoff."""
+
+_SESSION = requests.Session()
+"""Session shared by all requests to the API, so that connections are reused."""
+_SESSION.headers.update({"Accept": "application/json"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10, pool_maxsize=2 * _FETCH_WORKERS, max_retries=_RETRY
+    ),
+)
 
 
 class CarbonIntensity:
@@ -28,37 +70,161 @@ class CarbonIntensity:
         """Initialize the CarbonIntensity object.
 
         Args:
-            time (datetime): The time for which to fetch carbon intensity data.
+            time (datetime): The time for which to fetch carbon intensity data. The
+                data is for the 30 minute period containing this time.
         """
-        self._stime = time.strftime("%Y-%m-%dT%H:%MZ")
-        self._stime_plus = (time + timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%MZ")
+        start = _period_start(time)
+        self._stime = start.strftime(_TIME_FORMAT)
+        self._stime_plus = (start + _PERIOD).strftime(_TIME_FORMAT)
 
-    def fetch(self) -> float:
+    def fetch(self, session: requests.Session | None = None) -> float:
         """Fetch carbon intensity data from the API for the specified time and region.
 
+        Args:
+            session (requests.Session | None): Session to make the request with. If
+                None, a session shared by all requests from this module is used, so
+                that connections are reused.
+
+        Returns:
+            float: The actual carbon intensity in gCO2/kWh if reported, otherwise the
+                forecasted carbon intensity.
+
+        Raises:
+            ValueError: If the API request fails, returns an error status or has no
+                data for the period.
+        """
+        intensities = self._fetch_window(self._stime, self._stime_plus, session)
+        try:
+            return intensities[self._stime]
+        except KeyError:
+            raise ValueError(f"No carbon intensity data for {self._stime}")
+
+    @classmethod
+    def fetch_range(
+        cls, start: datetime, end: datetime, session: requests.Session | None = None
+    ) -> dict[str, float]:
+        """Fetch carbon intensity data for every 30 minute period in a time range.
+
+        All of the periods are fetched with a single request to the API.
+
+        Args:
+            start (datetime): The start of the time range.
+            end (datetime): The end of the time range, at most 14 days after `start`.
+            session (requests.Session | None): Session to make the request with. If
+                None, the session shared by all requests from this module is used.
+
         Returns:
-            float: The forecasted carbon intensity in gCO2/kWh.
+            dict[str, float]: The carbon intensity in gCO2/kWh of each period, as
+                returned by `fetch`, keyed by the start of the period in the format
+                ``%Y-%m-%dT%H:%MZ``.
 
         Raises:
             ValueError: If the API request fails or returns an error status.
         """
-        headers = {"Accept": "application/json"}
-        response = requests.get(
-            f"https://api.carbonintensity.org.uk/regional/intensity/{self._stime}/{self._stime_plus}/regionid/{self.REGIONID}",
-            params={},
-            headers=headers,
+        return cls._fetch_window(
+            start.strftime(_TIME_FORMAT), end.strftime(_TIME_FORMAT), session
         )
 
-        if response.status_code != 200:
+    @classmethod
+    def _fetch_window(
+        cls, stime: str, etime: str, session: requests.Session | None
+    ) -> dict[str, float]:
+        """Fetch carbon intensity data for each period between two formatted times.
+
+        See `fetch_range` for a description of the arguments and return value.
+        """
+        response = (session or _SESSION).get(
+            f"https://api.carbonintensity.org.uk/regional/intensity/{stime}/{etime}/regionid/{cls.REGIONID}",
+            timeout=_TIMEOUT,
+        )
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
             raise ValueError(
                 f"Failed to fetch carbon intensity data: "
                 f"{response.status_code} {response.text}"
+            ) from e
+
+        # Regional data is normally only forecasted,
+        # but prefer the actual intensity if given.
+        # The body is parsed as bytes, without detecting its encoding first.
+        intensities = {}
+        for period in _loads_json(response.content)["data"]["data"]:
+            intensity = period["intensity"]
+            actual = intensity.get("actual")
+            intensities[period["from"]] = float(
+                intensity["forecast"] if actual is None else actual
             )
+        return intensities
+
+    @classmethod
+    def fetch_many(
+        cls, times: Iterable[datetime], session: requests.Session | None = None
+    ) -> list[float]:
+        """Fetch carbon intensity data for many times.
+
+        Times falling in the same 30 minute period are only fetched once, and periods
+        close together in time are fetched in a single request with `fetch_range`.
+        Separate requests are made concurrently.
+
+        Args:
+            times (Iterable[datetime]): The times for which to fetch carbon intensity.
+            session (requests.Session | None): Session to make the requests with. If
+                None, the session shared by all requests from this module is used.
+
+        Returns:
+            list[float]: The carbon intensity in gCO2/kWh at each time, as returned by
+                `fetch`, in the same order as `times`.
 
-        # We ask for a 30 minute time period, so
-        # should only be one item in the data list
-        # which we select with `next(iter(...)).
-        # Can only get forecasted data for regions
-        intensity = next(iter(response.json()["data"]["data"]))["intensity"]["forecast"]
+        Raises:
+            ValueError: If any API request fails, returns an error status or has no
+                data for a wanted period.
+        """
+        starts = [_period_start(time) for time in times]
+
+        # Group the wanted periods into windows that can each be fetched at once
+        windows: list[tuple[datetime, datetime]] = []
+        for start in sorted(set(starts)):
+            if windows:
+                first, last = windows[-1]
+                if start - last <= _MAX_GAP and start + _PERIOD - first <= _MAX_RANGE:
+                    windows[-1] = (first, start)
+                    continue
+            windows.append((start, start))
+
+        intensities: dict[str, float] = {}
+        with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as executor:
+            for fetched in executor.map(
+                lambda window: cls.fetch_range(window[0], window[1] + _PERIOD, session),
+                windows,
+            ):
+                intensities.update(fetched)
+
+        keys = [start.strftime(_TIME_FORMAT) for start in starts]
+        if missing := sorted(set(keys).difference(intensities)):
+            raise ValueError(f"No carbon intensity data for {', '.join(missing)}")
+        return [intensities[key] for key in keys]
+
+    @classmethod
+    async def fetch_many_async(
+        cls, times: Iterable[datetime], session: requests.Session | None = None
+    ) -> list[float]:
+        """Fetch carbon intensity data for many times without blocking an event loop.
+
+        The requests are made as by `fetch_many`, in a worker thread.
+
+        Args:
+            times (Iterable[datetime]): The times for which to fetch carbon intensity.
+            session (requests.Session | None): Session to make the requests with. If
+                None, the session shared by all requests from this module is used.
 
-        return float(intensity)
+        Returns:
+            list[float]: The carbon intensity in gCO2/kWh at each time, as returned by
+                `fetch`, in the same order as `times`.
+
+        Raises:
+            ValueError: If any API request fails, returns an error status or has no
+                data for a wanted period.
+        """
+        return await asyncio.to_thread(cls.fetch_many, list(times), session)
@@ -8,12 +8,43 @@ the electrical energy consumed by the job.
 import json
 import re
 import subprocess
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Self
+from typing import TYPE_CHECKING, ClassVar, Self, TypedDict
 
+from carbon._json import loads as _loads_json
 from carbon.node import Node
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+_JOB_ID_RE = re.compile(r"\d+(\[\d+\])?")
+"""Pattern of valid job IDs: digits, optionally with an array index in brackets."""
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+"""Number of each month, by its abbreviated name as used in times from PBS."""
+
+_MEM_RE = re.compile(r"(\d+(?:\.\d+)?)(kb|mb|gb|tb)")
+"""Pattern of amounts of memory from PBS: a number followed by a unit."""
+
+_MEM_MULT = {"kb": 1 / 1024**2, "mb": 1 / 1024, "gb": 1.0, "tb": 1024.0}
+"""Number of gigabytes in each unit of memory used by PBS."""
+
+_QSTAT_WORKERS = 16
+"""Maximum number of concurrent qstat commands run by `Job.fromPBS_many`."""
+
+_SNAPSHOT_MAX_AGE = 60.0
+"""Time in seconds for which jobs fetched from PBS are reused by `Job.fromPBS`."""
+
 
 class UnknownJobIDError(ValueError):
     """Raised for unknown job IDs."""
@@ -33,20 +64,114 @@ class JobStateError(ValueError):
     pass
 
 
+class UnsupportedJobTypeError(ValueError):
+    """Raised for jobs of a type that cannot be analysed, such as array jobs."""
+
+    pass
+
+
+def is_array_job(id: str) -> bool:
+    """Check whether a job ID refers to a whole array job.
+
+    Args:
+        id (str): The job identifier, optionally including a server suffix.
+
+    Returns:
+        bool: True if the ID is of an array job rather than a single job.
+
+    >>> is_array_job("12345[].pbs")
+    True
+    >>> is_array_job("12345[1].pbs")
+    False
+    """
+    return id.partition(".")[0].endswith("[]")
+
+
+class _QstatJob(TypedDict):
+    """The fields used from a job's entry in the output of ``qstat -xfF json``."""
+
+    job_state: str
+    exec_host: str
+    stime: str
+    resources_used: dict[str, str | int]
+    Resource_List: dict[str, str | int]
+
+
 def hours(time: str) -> float:
     """Convert a time string in HH:MM:SS format to hours.
 
     Args:
-        time (str): Time string in the format 'HH:MM:SS'.
+        time (str): Time string in the format 'HH:MM:SS', or a number of seconds.
 
     Returns:
         float: The time in hours.
+
+    >>> hours("01:30:00")
+    1.5
+    >>> hours("5400")
+    1.5
     """
-    h, m, s = time.split(":")
-    return float(h) + float(m) / 60.0 + float(s) / 3600.0
+    if ":" not in time:
+        return float(time) / 3600.0
+    h, m, s = map(int, time.split(":", 2))
+    return (h * 3600 + m * 60 + s) / 3600.0
 
 
-@dataclass
+def _memory_gb(memory: str) -> float:
+    """Convert an amount of memory as given by PBS to gigabytes.
+
+    Args:
+        memory (str): Memory in the format 'Xgb', where X is a number and the unit is
+            one of kb, mb, gb or tb.
+
+    Returns:
+        float: The memory in gigabytes.
+
+    Raises:
+        NotImplementedError: If the memory format is not supported.
+
+    >>> _memory_gb("32gb")
+    32.0
+    >>> _memory_gb("512mb")
+    0.5
+    """
+    match = _MEM_RE.fullmatch(memory)
+    if match is None:
+        raise NotImplementedError(
+            f"Memory format '{memory}' not implemented. "
+            "Expected format is 'Xgb' where X is a number and the unit is one of kb, "
+            "mb, gb or tb."
+        )
+    return float(match[1]) * _MEM_MULT[match[2]]
+
+
+def _parse_pbs_time(time: str) -> datetime:
+    """Parse a time as formatted by PBS, such as the start time of a job.
+
+    Equivalent to ``datetime.strptime(time, "%a %b %d %H:%M:%S %Y")`` for the English
+    month names PBS uses, but much faster.
+
+    Args:
+        time (str): Time string in the format 'Thu Aug 21 10:00:00 2025'.
+
+    Returns:
+        datetime: The parsed time.
+
+    Raises:
+        ValueError: If the time is not in the expected format.
+
+    >>> _parse_pbs_time("Thu Aug  7 10:05:30 2025")
+    datetime.datetime(2025, 8, 7, 10, 5, 30)
+    """
+    try:
+        _, month, day, hms, year = time.split()
+        h, m, s = hms.split(":")
+        return datetime(int(year), _MONTHS[month], int(day), int(h), int(m), int(s))
+    except (KeyError, ValueError):
+        raise ValueError(f"Malformed PBS time: {time!r}")
+
+
+@dataclass(slots=True, frozen=True)
 class Job:
     """Represents a compute job, including its resource usage and timing information."""
 
@@ -71,10 +196,16 @@ class Job:
     node: str
     """The node the job was executed on."""
 
+    _snapshot: ClassVar[dict[str, tuple[float, "Job"]]] = {}
+    """Jobs recently fetched from PBS, with the time they were fetched, by job ID."""
+
     @classmethod
     def fromPBS(cls, id: str) -> Self:
         """Create a Job object by fetching data from PBS based on the job ID.
 
+        Jobs fetched in the last minute, including by `fromPBS_many`, are reused
+        rather than queried again.
+
         Args:
             id (str): The job identifier to fetch from the scheduler.
 
@@ -89,42 +220,154 @@ class Job:
             JobStateError: If the job is in an invalid state.
             NotImplementedError: If the memory format is not supported.
         """
-        # Job ID should either be digits only or digits plus an index in square brackets
-        if not re.fullmatch(r"\d+(\[\d+\])?", id):
-            raise MalformedJobIDError(
-                f"Malformed job ID: {id}. Should contain only digits"
+        cached = cls._snapshot.get(id)
+        if (
+            cached is not None
+            and isinstance(cached[1], cls)
+            and time.monotonic() - cached[0] < _SNAPSHOT_MAX_AGE
+        ):
+            return cached[1]
+        return cls.fromPBS_many([id])[0]
+
+    @classmethod
+    def fromPBS_many(cls, ids: Iterable[str]) -> list[Self]:
+        """Create Job objects for many jobs, fetching their data from PBS at once.
+
+        A single ``qstat`` command is run for all of the jobs, rather than one for
+        each job. Any jobs it does not report are then fetched individually, with
+        the commands run concurrently.
+
+        Args:
+            ids (Iterable[str]): The job identifiers to fetch from the scheduler.
+
+        Returns:
+            list[Job]: The jobs populated with scheduler data, in the same order as
+                `ids`.
+
+        Raises:
+            ValueError: If fetching or parsing job data fails, or if no job data is
+                found.
+            UnknownJobIDError: If PBS does not know one of the job IDs.
+            MalformedJobIDError: If a job ID is not formatted correctly.
+            JobStateError: If a job is in an invalid state.
+            NotImplementedError: If the memory format is not supported.
+        """
+        ids = list(ids)
+        for id in ids:
+            if not _JOB_ID_RE.fullmatch(id):
+                raise MalformedJobIDError(
+                    f"Malformed job ID: {id}. Should contain only digits"
+                )
+
+        unique_ids = list(dict.fromkeys(ids))
+        if len(unique_ids) == 1:
+            jobs = {unique_ids[0]: cls._fetch_one(unique_ids[0])}
+        elif unique_ids:
+            jobs, _ = cls._run_qstat(unique_ids)
+            # Query any jobs missing from the batch individually, so that each gets
+            # its own error or a server that rejects some IDs in a batch still works
+            if missing := [id for id in unique_ids if id not in jobs]:
+                workers = min(_QSTAT_WORKERS, len(missing))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    jobs.update(zip(missing, executor.map(cls._fetch_one, missing)))
+        else:
+            return []
+
+        return [jobs[id] for id in ids]
+
+    @classmethod
+    def _fetch_one(cls, id: str) -> Self:
+        """Fetch a single job from PBS.
+
+        See `fromPBS` for a description of the arguments, return value and errors.
+        """
+        jobs, output = cls._run_qstat([id])
+        if id in jobs:
+            return jobs[id]
+        elif output.returncode == 153:
+            raise UnknownJobIDError(f"Unknown job ID: {id}")
+        elif output.returncode == 1 or output.returncode == 170:
+            raise MalformedJobIDError(f"Malformed job ID: {id}")
+        elif output.returncode != 0:
+            raise ValueError(
+                f"Failed to fetch job data: qstat exited with code "
+                f"{output.returncode}: {output.stderr.decode(errors='replace')}"
             )
+        else:
+            raise ValueError(f"No job data found for ID {id}")
+
+    @classmethod
+    def _run_qstat(
+        cls, ids: list[str]
+    ) -> tuple[dict[str, Self], "subprocess.CompletedProcess[bytes]"]:
+        """Run a single qstat command for some jobs, and parse the jobs it reports.
 
-        cmd = f"qstat -xfF json {id}"
+        The parsed jobs are added to the snapshot reused by `fromPBS`, and expired
+        jobs are removed from it.
 
+        Args:
+            ids (list[str]): The job identifiers to fetch from the scheduler.
+
+        Returns:
+            tuple[dict[str, Job], CompletedProcess[bytes]]: The jobs reported by
+                qstat, keyed by the ID they were requested by, and the completed
+                qstat process.
+
+        Raises:
+            ValueError: If qstat cannot be run or its output cannot be parsed.
+            JobStateError: If a job is in an invalid state.
+            NotImplementedError: If the memory format is not supported.
+        """
         try:
             output = subprocess.run(
-                cmd,
-                shell=True,
-                check=True,
+                ["qstat", "-xfF", "json", *ids],
                 timeout=20,
                 capture_output=True,
             )
-        except subprocess.CalledProcessError as e:
-            if e.returncode == 153:
-                raise UnknownJobIDError(f"Unknown job ID: {id}")
-            elif e.returncode == 1 or e.returncode == 170:
-                raise MalformedJobIDError(f"Malformed job ID: {id}")
-            else:
-                raise ValueError(f"Failed to fetch job data: {e}")
+        except (OSError, subprocess.SubprocessError) as e:
+            raise ValueError(f"Failed to fetch job data: {e}")
+
+        # qstat still reports the jobs it knows about if any of them are unknown.
+        # The output is parsed as bytes, without decoding it to a string first.
+        job_data = {}
+        if output.stdout.strip():
+            try:
+                job_data = _loads_json(output.stdout)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse job data: {e}")
+        entries: dict[str, _QstatJob] = job_data.get("Jobs") or {}
+
+        # Forget expired jobs, so the snapshot does not grow without bound
+        fetched_at = time.monotonic()
+        for id, (then, _) in list(cls._snapshot.items()):
+            if fetched_at - then >= _SNAPSHOT_MAX_AGE:
+                cls._snapshot.pop(id, None)
+
+        # Match each job to the ID it was requested by, without the server suffix
+        jobs = {}
+        for internal_id, entry in entries.items():
+            job = cls._from_qstat(internal_id, entry)
+            id = internal_id.partition(".")[0]
+            jobs[id] = job
+            cls._snapshot[id] = (fetched_at, job)
+        return jobs, output
 
-        try:
-            job_data = json.loads(output.stdout)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse job data: {e}")
-        if not job_data:
-            raise ValueError(f"No job data found for ID {id}")
+    @classmethod
+    def _from_qstat(cls, internal_id: str, entry: "_QstatJob") -> Self:
+        """Create a Job object from its entry in the output of ``qstat -xfF json``.
+
+        Args:
+            internal_id (str): The job ID as recorded by the job scheduler.
+            entry (_QstatJob): The job's entry in the qstat output.
 
-        # Get the job ID as recorded by the job scheduler.
-        # Here we assume only one job was captured by qstat.
-        # If multiple jobs are returned, this will only return the first one.
-        internal_id = next(iter(job_data["Jobs"]))
-        state = job_data["Jobs"][internal_id]["job_state"]
+        Returns:
+            Job: An instance of the Job class populated with scheduler data.
+
+        Raises:
+            JobStateError: If the job is in an invalid state.
+            NotImplementedError: If the memory format is not supported.
+        """
+        state = entry["job_state"]
         if not (state == "F" or state == "R"):
             raise JobStateError(
                 f"Analysis of jobs with state {state} is not "
@@ -139,32 +382,23 @@ class Job:
                 "and may not reflect total emissions."
             )
 
-        node = job_data["Jobs"][internal_id]["exec_host"].split("/", 1)[0]
-        resources_used = job_data["Jobs"][internal_id]["resources_used"]
-        resources_allocated = job_data["Jobs"][internal_id]["Resource_List"]
+        node = entry["exec_host"].split("/", 1)[0]
+        resources_used = entry["resources_used"]
+        resources_allocated = entry["Resource_List"]
 
         # Process some of the job data.
-        starttime = datetime.strptime(
-            job_data["Jobs"][internal_id]["stime"], "%a %b %d %H:%M:%S %Y"
-        )
+        starttime = _parse_pbs_time(entry["stime"])
         # Allocated memory in gb.
         # Allocated memory is more relevant for energy consumption.
         # From DOI:10.1002/advs.202100707
-        _memory = resources_allocated["mem"]
-        if _memory.endswith("gb"):
-            memory = float(_memory[:-2])
-        else:
-            raise NotImplementedError(
-                f"Memory format '{_memory}' not implemented. "
-                "Expected format is 'Xgb' where X is an integer."
-            )
+        memory = _memory_gb(str(resources_allocated["mem"]))
 
         # Create a Job object with the fetched data
         return cls(
             id=internal_id,
             starttime=starttime,
-            runtime=hours(resources_used["walltime"]),
-            cputime=hours(resources_used["cput"]),
+            runtime=hours(str(resources_used["walltime"])),
+            cputime=hours(str(resources_used["cput"])),
             memory=memory,
             ngpus=int(resources_allocated["ngpus"]),
             node=node,
@@ -181,11 +415,44 @@ class Job:
             float: The energy consumed in kilowatt-hours.
         """
         return (
-            (
-                node.per_core_power_watts * self.cputime
-                + node.per_gpu_power_watts * self.ngpus * self.runtime
-                + node.per_gb_power_watts * self.memory * self.runtime
-            )
-            * pue
-            / 1000.0
+            node._per_core_kw * self.cputime
+            + node._per_gpu_kw * self.ngpus * self.runtime
+            + node._per_gb_kw * self.memory * self.runtime
+        ) * pue
+
+    @classmethod
+    def calculate_energies(
+        cls, jobs: Sequence[Self], nodes: Sequence[Node], pue: float
+    ) -> "npt.NDArray[np.float64]":
+        """Calculate energy consumption in kilowatt-hours for many compute jobs.
+
+        The jobs are gathered into an array for each quantity, so the energy of all
+        of them is calculated at once by `carbon.energy.calculate_energies`.
+
+        Args:
+            jobs (Sequence[Job]): The compute jobs.
+            nodes (Sequence[Node]): The compute node each job was executed on.
+            pue (float): Power Usage Effectiveness of the data center.
+
+        Returns:
+            NDArray[float64]: The energy consumed by each job in kilowatt-hours, as
+                returned by `calculate_energy`.
+
+        Raises:
+            ValueError: If there is not one node for each job.
+        """
+        from carbon.energy import calculate_energies
+
+        if len(jobs) != len(nodes):
+            raise ValueError(f"Expected {len(jobs)} nodes, got {len(nodes)}.")
+
+        return calculate_energies(
+            cputime=[job.cputime for job in jobs],
+            runtime=[job.runtime for job in jobs],
+            memory=[job.memory for job in jobs],
+            ngpus=[job.ngpus for job in jobs],
+            per_core_kw=[node._per_core_kw for node in nodes],
+            per_gpu_kw=[node._per_gpu_kw for node in nodes],
+            per_gb_kw=[node._per_gb_kw for node in nodes],
+            pue=pue,
         )
@@ -4,12 +4,88 @@ This module holds functionality for representing a compute node, including fetch
 information about the hardware components.
 """
 
+import functools
 import subprocess
-from dataclasses import dataclass
+from collections.abc import Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
 from typing import Self
 
+_Hardware = tuple[str, str | None, str]
+"""The CPU model, GPU model, or None if GPU not present, and memory type of a node."""
+
+
+def _parse_hardware(lines: Iterable[str]) -> _Hardware:
+    """Parse the hardware types of a node from its attributes as listed by qmgr.
+
+    Args:
+        lines (Iterable[str]): Lines of ``qmgr -c "list node ..."`` output for the
+            node.
+
+    Returns:
+        _Hardware: The CPU model, or an empty string if not set, the GPU model, or
+            None if GPU not present, and the memory type.
+    """
+    cpu_type: str = ""
+    gpu_type: str | None = None
+    mem_type: str = "common"  # Memory hardcoded to common type
+    for line in lines:
+        if "resources_available.cpu_type" in line:
+            cpu_type = line.split("=")[-1].strip()
+        if "resources_available.gpu_type" in line:
+            val = line.split("=")[-1].strip()
+            gpu_type = val if val != "None" else None
+    return cpu_type, gpu_type, mem_type
+
+
+@functools.lru_cache(maxsize=256)
+def _query_pbs_node(node_label: str) -> _Hardware:
+    """Fetch the hardware types of a node from PBS, memoized for the process.
+
+    Args:
+        node_label (str): The label of the node to query.
+
+    Returns:
+        _Hardware: The hardware types, as returned by `_parse_hardware`.
+    """
+    result = subprocess.run(
+        ["qmgr", "-c", f"list node {node_label}"],
+        timeout=20,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return _parse_hardware(result.stdout.splitlines())
+
+
+@functools.cache
+def _query_all_pbs_nodes() -> dict[str, _Hardware]:
+    """Fetch the hardware types of every node from PBS at once, memoized.
+
+    Returns:
+        dict[str, _Hardware]: The hardware types of each node, as returned by
+            `_parse_hardware`, keyed by node label.
+    """
+    result = subprocess.run(
+        ["qmgr", "-c", "list node @default"],
+        timeout=60,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Each node's attributes are listed as indented lines under a "Node <label>" line
+    nodes: dict[str, list[str]] = {}
+    lines: list[str] = []
+    for line in result.stdout.splitlines():
+        if line.startswith("Node "):
+            lines = nodes.setdefault(line[5:].strip(), [])
+        else:
+            lines.append(line)
+    return {label: _parse_hardware(lines) for label, lines in nodes.items()}
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Node:
     """Represents a compute node, including hardware models and power usage."""
 
@@ -34,12 +110,30 @@ class Node:
     per_gb_power_watts: float
     """Power usage per GB of memory in watts."""
 
+    _per_core_kw: float = field(init=False, repr=False, compare=False)
+    """Power usage per CPU core in kilowatts."""
+
+    _per_gpu_kw: float = field(init=False, repr=False, compare=False)
+    """Power usage per GPU in kilowatts."""
+
+    _per_gb_kw: float = field(init=False, repr=False, compare=False)
+    """Power usage per GB of memory in kilowatts."""
+
+    def __post_init__(self) -> None:
+        """Precompute the power usage of each component in kilowatts."""
+        # The node is frozen, so the derived fields are set as dataclasses do
+        object.__setattr__(self, "_per_core_kw", self.per_core_power_watts / 1000.0)
+        object.__setattr__(self, "_per_gpu_kw", self.per_gpu_power_watts / 1000.0)
+        object.__setattr__(self, "_per_gb_kw", self.per_gb_power_watts / 1000.0)
+
     @classmethod
     def fromPBS(
         cls, node_label: str, component_powers: dict[str, dict[str, dict[str, float]]]
     ) -> Self:
         """Create a Node object by fetching info from PBS and cluster config.
 
+        The hardware of each node is only fetched from PBS once per process.
+
         Args:
             node_label (str): The label of the node to query.
             component_powers (dict): Dictionary with keys 'cpus', 'gpus', 'memory'.
@@ -47,19 +141,65 @@ class Node:
         Returns:
             Node: An instance of Node with hardware and power info.
         """
-        cmd = f'qmgr -c "list node {node_label}"'
-        result = subprocess.run(
-            cmd, shell=True, timeout=20, capture_output=True, text=True, check=True
+        return cls._from_hardware(
+            node_label, _query_pbs_node(node_label), component_powers
         )
-        cpu_type: str = ""
-        gpu_type: str | None = None
-        mem_type: str = "common"  # Memory hardcoded to common type
-        for line in result.stdout.splitlines():
-            if "resources_available.cpu_type" in line:
-                cpu_type = line.split("=")[-1].strip()
-            if "resources_available.gpu_type" in line:
-                val = line.split("=")[-1].strip()
-                gpu_type = val if val != "None" else None
+
+    @classmethod
+    def fromPBS_many(
+        cls,
+        node_labels: Iterable[str],
+        component_powers: dict[str, dict[str, dict[str, float]]],
+    ) -> list[Self]:
+        """Create Node objects for many nodes, fetching their info from PBS at once.
+
+        For more than one node, the hardware of every node is listed with a single
+        ``qmgr`` command, rather than one for each node. Any nodes missing from the
+        list are fetched individually, as by `fromPBS`.
+
+        Args:
+            node_labels (Iterable[str]): The labels of the nodes to query.
+            component_powers (dict): Dictionary with keys 'cpus', 'gpus', 'memory'.
+
+        Returns:
+            list[Node]: The nodes with hardware and power info, in the same order as
+                `node_labels`.
+        """
+        node_labels = list(node_labels)
+        hardware: dict[str, _Hardware] = {}
+        if len(set(node_labels)) > 1:
+            # Fall back to fetching the nodes individually if listing them fails
+            with suppress(OSError, subprocess.SubprocessError):
+                hardware = _query_all_pbs_nodes()
+
+        nodes: dict[str, Self] = {}
+        for label in node_labels:
+            if label not in nodes:
+                nodes[label] = cls._from_hardware(
+                    label,
+                    hardware.get(label) or _query_pbs_node(label),
+                    component_powers,
+                )
+        return [nodes[label] for label in node_labels]
+
+    @classmethod
+    def _from_hardware(
+        cls,
+        node_label: str,
+        hardware: _Hardware,
+        component_powers: dict[str, dict[str, dict[str, float]]],
+    ) -> Self:
+        """Create a Node object from its hardware types and the cluster config.
+
+        Args:
+            node_label (str): The label of the node.
+            hardware (_Hardware): The node's hardware types, from PBS.
+            component_powers (dict): Dictionary with keys 'cpus', 'gpus', 'memory'.
+
+        Returns:
+            Node: An instance of Node with hardware and power info.
+        """
+        cpu_type, gpu_type, mem_type = hardware
 
         # Look up power usage for cpu/gpu/memory
         try:
@@ -0,0 +1,76 @@
+"""The report module.
+
+This module provides functionality for formatting human-readable reports of the
+estimated energy consumption and carbon emissions of a compute job.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from carbon import RunResult
+    from carbon.clusterconfig import ClusterConfig
+
+_TEMPLATE = (
+    "Cluster information:"
+    "\n    Name: {cluster_name}"
+    "\n    PUE: {pue}"
+    "\nNode information:"
+    "\n    Name: {node_name}"
+    "\n    CPU model: {cpu_type}"
+    "\n    GPU model: {gpu_type}"
+    "\n    Memory type: {mem_type}"
+    "\n    CPU power draw (per core): {per_core_power_watts} W"
+    "\n    GPU power draw (per GPU): {per_gpu_power_watts} W"
+    "\n    Memory power draw (per GB): {per_gb_power_watts} W"
+    "\nCalculation information:"
+    "\n    Estimate is for scope 2 emissions only "
+    "(i.e., indirect emissions due to purchased electricity)."
+    "\n    {intensity_note}"
+    "\n    Estimates use the methodology of the Green Algorithms project by "
+    "the Lannelongue group at the University of Cambridge "
+    "(https://www.green-algorithms.org/, "
+    "https://doi.org/10.1002/advs.202100707)"
+)
+"""Template for the verbose description of the cluster, node and calculation."""
+
+_LONDON_INTENSITY_NOTE = (
+    "Estimate is performed AS IF carbon intensity was London average at job start "
+    "time, although electricity to Imperial's clusters is certified as 100% "
+    "renewable."
+)
+"""Note on the carbon intensity used when it is fetched for the job start time."""
+
+_RENEWABLE_INTENSITY_NOTE = (
+    "Estimate assumes electricity to the cluster is 100% renewable, so carbon "
+    "intensity is zero."
+)
+"""Note on the carbon intensity used when the cluster assumes renewable power."""
+
+
+def format_verbose(result: "RunResult", config: "ClusterConfig") -> str:
+    """Describe the cluster, node and calculation behind an emissions estimate.
+
+    Args:
+        result (RunResult): The estimated energy consumption and emissions of a job.
+        config (ClusterConfig): The configuration of the cluster the job ran on.
+
+    Returns:
+        str: The description, over multiple lines.
+    """
+    node = result.node
+    return _TEMPLATE.format_map(
+        {
+            "cluster_name": config.cluster_name,
+            "pue": config.pue,
+            "node_name": node.name,
+            "cpu_type": node.cpu_type,
+            "gpu_type": node.gpu_type,
+            "mem_type": node.mem_type,
+            "per_core_power_watts": node.per_core_power_watts,
+            "per_gpu_power_watts": node.per_gpu_power_watts,
+            "per_gb_power_watts": node.per_gb_power_watts,
+            "intensity_note": _RENEWABLE_INTENSITY_NOTE
+            if config.assume_renewable
+            else _LONDON_INTENSITY_NOTE,
+        }
+    )
@@ -0,0 +1,25 @@
+"""Unit tests for atomic file replacement."""
+
+import pytest
+
+from carbon._atomic import write_atomic
+
+
+def test_write_atomic(tmp_path) -> None:
+    """Test that a file is replaced without leaving temporary files behind."""
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    write_atomic(b"new", path)
+    assert path.read_bytes() == b"new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_atomic_failure(tmp_path, mocker) -> None:
+    """Test that the temporary file is removed if the file cannot be replaced."""
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    mocker.patch("os.replace", side_effect=OSError)
+    with pytest.raises(OSError):
+        write_atomic(b"new", path)
+    assert path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [path]
@@ -1,8 +1,263 @@
 """Tests for the main module."""
 
-from carbon import __version__
+import json
+import shutil
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from carbon import (
+    DEFAULT_INTENSITY,
+    __version__,
+    _cached_intensities,
+    _cached_intensity,
+    _intensity_bucket,
+    _load_config_cached,
+    _load_intensity_cache,
+    run,
+    run_many,
+)
+from carbon.clusterconfig import ClusterConfig, compile_yaml_to_json
+from carbon.job import Job, UnsupportedJobTypeError
+from carbon.node import Node
+
+DUMMY_CONFIG = Path(__file__).parent.parent / "clusters" / "dummy.yaml"
 
 
 def test_version():
     """Check that the version is acceptable."""
     assert isinstance(__version__, str)
+
+
+def test_load_config_cached(tmp_path, cache_dir, mocker):
+    """Check that the parsed config is cached and reused until the file changes."""
+    config_path = tmp_path / "dummy.yaml"
+    shutil.copy(DUMMY_CONFIG, config_path)
+
+    config = _load_config_cached(str(config_path))
+    assert isinstance(config, ClusterConfig)
+    assert config.cluster_name == "DummyCluster"
+    assert not list(tmp_path.glob("dummy.yaml.*"))
+    assert len(list((cache_dir / "config").glob("*.json"))) == 1
+
+    # A fresh cache should bypass the YAML parser and validation entirely
+    load = mocker.patch("yaml.load")
+    validate = mocker.spy(ClusterConfig, "model_validate")
+    assert _load_config_cached(str(config_path)) == config
+    load.assert_not_called()
+    validate.assert_not_called()
+
+    # A cache written for another version of the format is ignored
+    mocker.stopall()
+    (cache_path,) = (cache_dir / "config").glob("*.json")
+    cached = json.loads(cache_path.read_text())
+    cached["key"][0] -= 1
+    cached["config"]["cluster_name"] = "Stale"
+    cache_path.write_text(json.dumps(cached))
+    assert _load_config_cached(str(config_path)) == config
+
+    # A corrupt cache is ignored
+    cache_path.write_text(cache_path.read_text()[:10])
+    assert _load_config_cached(str(config_path)) == config
+
+    # Modifying the config invalidates the cache
+    config_path.write_text(config_path.read_text().replace("DummyCluster", "Other"))
+    mocker.stopall()
+    assert _load_config_cached(str(config_path)).cluster_name == "Other"
+
+
+def test_load_config_cached_json(tmp_path, mocker):
+    """Check that a compiled JSON config is preferred while it is up to date."""
+    config_path = tmp_path / "dummy.yaml"
+    shutil.copy(DUMMY_CONFIG, config_path)
+    compile_yaml_to_json(config_path)
+
+    load = mocker.patch("yaml.load")
+    assert _load_config_cached(str(config_path)).cluster_name == "DummyCluster"
+    load.assert_not_called()
+
+    # Recompiling the JSON invalidates the cache, even if the YAML is unchanged
+    json_path = config_path.with_suffix(".json")
+    json_path.write_text(json_path.read_text().replace("DummyCluster", "Other"))
+    assert _load_config_cached(str(config_path)).cluster_name == "Other"
+
+
+def test_cached_intensity(tmp_path, monkeypatch, mocker):
+    """Check that carbon intensity is only fetched once per period."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    fetch = mocker.patch(
+        "carbon.intensity.CarbonIntensity.fetch_many", return_value=[120.0]
+    )
+    bucket = _intensity_bucket(datetime(2025, 7, 9, 12, 17))
+    assert bucket == "2025-07-09T12:00:00"
+
+    assert _cached_intensity(bucket) == 120.0
+    assert _cached_intensity(bucket) == 120.0
+    fetch.assert_called_once()
+
+    # Values persist on disk between processes
+    _load_intensity_cache.cache_clear()
+    assert _cached_intensity(bucket) == 120.0
+    fetch.assert_called_once()
+    assert (tmp_path / "carbon" / "intensity.json").exists()
+
+
+def test_cached_intensities(tmp_path, monkeypatch, mocker):
+    """Check that only the periods not cached on disk are fetched in a batch."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    fetch_many = mocker.patch(
+        "carbon.intensity.CarbonIntensity.fetch_many",
+        side_effect=lambda times: [100.0 + time.hour for time in times],
+    )
+    early, late = "2025-07-09T10:00:00", "2025-07-09T12:30:00"
+
+    assert _cached_intensities([early, early]) == {early: 110.0}
+    assert _cached_intensities([late, early]) == {early: 110.0, late: 112.0}
+    assert _cached_intensities([early, late]) == {early: 110.0, late: 112.0}
+    assert [list(call.args[0]) for call in fetch_many.call_args_list] == [
+        [datetime(2025, 7, 9, 10)],
+        [datetime(2025, 7, 9, 12, 30)],
+    ]
+
+
+def test_cached_intensities_forecast(tmp_path, monkeypatch, mocker):
+    """Check that the intensity of periods yet to end expires after 30 minutes."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    fetch_many = mocker.patch(
+        "carbon.intensity.CarbonIntensity.fetch_many", return_value=[100.0]
+    )
+    bucket = _intensity_bucket(datetime.now(UTC))
+
+    assert _cached_intensities([bucket]) == {bucket: 100.0}
+    _load_intensity_cache.cache_clear()
+    assert _cached_intensities([bucket]) == {bucket: 100.0}
+    fetch_many.assert_called_once()
+
+    mocker.patch("time.time", return_value=time.time() + 31 * 60)
+    assert _cached_intensities([bucket]) == {bucket: 100.0}
+    assert fetch_many.call_count == 2
+
+
+@pytest.fixture
+def config(tmp_path) -> ClusterConfig:
+    """Fixture for the dummy cluster config."""
+    config_path = tmp_path / "dummy.yaml"
+    shutil.copy(DUMMY_CONFIG, config_path)
+    return _load_config_cached(str(config_path))
+
+
+def test_run_dummy(config):
+    """Check the estimate for the dummy job."""
+    result = run("12345", config, default_intensity=True)
+    assert result.job.id == "12345"
+    assert result.node.name == "dummy_node"
+    assert result.carbon_intensity == DEFAULT_INTENSITY
+    assert result.energy_consumed == pytest.approx(10.222056)
+    assert result.emissions == pytest.approx(10.222056 * DEFAULT_INTENSITY)
+
+
+def test_run_intensity(config, mocker):
+    """Check that the carbon intensity is looked up for the job start time."""
+    cached_intensity = mocker.patch("carbon._cached_intensity", return_value=100.0)
+    result = run("12345", config)
+    cached_intensity.assert_called_once_with("2025-07-09T12:00:00+00:00")
+    assert result.emissions == pytest.approx(100.0 * result.energy_consumed)
+
+
+def test_run_assume_renewable(config, mocker):
+    """Check that no carbon intensity is fetched when assuming renewable power."""
+    cached_intensity = mocker.patch("carbon._cached_intensities")
+    config = config.model_copy(update={"assume_renewable": True})
+
+    result = run("12345", config)
+    assert result.carbon_intensity == 0.0
+    assert result.emissions == 0.0
+    assert result.energy_consumed == pytest.approx(10.222056)
+
+    (result,) = run_many(["12345"], config)
+    assert result.emissions == 0.0
+    cached_intensity.assert_not_called()
+
+
+@pytest.fixture
+def pbs_config(config) -> ClusterConfig:
+    """Fixture for the dummy cluster config without a dummy job."""
+    return config.model_copy(update={"dummy_job": None})
+
+
+def mock_job(id: str) -> Job:
+    """Create a job as if fetched from PBS."""
+    return Job(
+        id=f"{id}.pbs",
+        starttime=datetime(2025, 7, 9, 12, int(id) % 60),
+        runtime=2.0,
+        cputime=4.0,
+        ngpus=0,
+        memory=8.0,
+        node=f"node{int(id) % 2}",
+    )
+
+
+def mock_node(label: str, component_powers) -> Node:
+    """Create a node as if fetched from PBS."""
+    return Node(
+        name=label,
+        cpu_type="rome",
+        gpu_type=None,
+        mem_type="common",
+        per_core_power_watts=3.52,
+        per_gpu_power_watts=0.0,
+        per_gb_power_watts=0.3725,
+    )
+
+
+def test_run_many(pbs_config, mocker):
+    """Check that batches match individual runs and share intensity lookups."""
+    mocker.patch.object(Job, "fromPBS", side_effect=mock_job)
+    job_from_pbs_many = mocker.patch.object(
+        Job, "fromPBS_many", side_effect=lambda ids: [mock_job(id) for id in ids]
+    )
+    mocker.patch.object(Node, "fromPBS", side_effect=mock_node)
+    node_from_pbs_many = mocker.patch.object(
+        Node,
+        "fromPBS_many",
+        side_effect=lambda labels, powers: [
+            mock_node(label, powers) for label in labels
+        ],
+    )
+    mocker.patch("carbon._cached_intensity", return_value=100.0)
+    cached_intensities = mocker.patch(
+        "carbon._cached_intensities",
+        side_effect=lambda buckets: dict.fromkeys(buckets, 100.0),
+    )
+
+    ids = ["10", "11.pbs", "40", "41"]
+    results = run_many(ids, pbs_config)
+    assert [result.job.id for result in results] == [
+        "10.pbs",
+        "11.pbs",
+        "40.pbs",
+        "41.pbs",
+    ]
+    job_from_pbs_many.assert_called_once()
+    node_from_pbs_many.assert_called_once()
+    assert len(node_from_pbs_many.call_args.args[0]) == 2
+    cached_intensities.assert_called_once()
+
+    for id, result in zip(ids, results):
+        expected = run(id, pbs_config)
+        assert result.job == expected.job
+        assert result.node == expected.node
+        assert result.carbon_intensity == expected.carbon_intensity
+        assert result.energy_consumed == pytest.approx(expected.energy_consumed)
+        assert result.emissions == pytest.approx(expected.emissions)
+
+
+def test_run_array_job(pbs_config):
+    """Check that array jobs are rejected."""
+    with pytest.raises(UnsupportedJobTypeError):
+        run("12345[].pbs", pbs_config)
+    with pytest.raises(UnsupportedJobTypeError):
+        run_many(["12345", "12346[]"], pbs_config)
@@ -0,0 +1,150 @@
+"""Unit tests for the ClusterConfig class."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from carbon.clusterconfig import (
+    ClusterConfig,
+    CPUConfig,
+    DummyJob,
+    compile_yaml_to_json,
+)
+
+
+@pytest.fixture
+def config() -> ClusterConfig:
+    """Fixture for a cluster config with a dummy job."""
+    return ClusterConfig.model_validate(
+        {
+            "cluster_name": "DummyCluster",
+            "pue": 1.3,
+            "cpus": {"rome": {"per_core_power_watts": 3.52}},
+            "gpus": {"RTX6000": {"per_gpu_power_watts": 295.0}},
+            "memory": {"common": {"per_gb_power_watts": 0.3725}},
+            "dummy_job": {
+                "start_time": "2025-07-09T12:00:00Z",
+                "cpu_time": 192.0,
+                "memory_usage": 12.0,
+                "run_time": 24.0,
+                "ngpus": 1,
+                "node": "dummy_node",
+                "cpu_type": "rome",
+                "gpu_type": "RTX6000",
+                "mem_type": "common",
+            },
+        }
+    )
+
+
+def test_build_dummy(config) -> None:
+    """Test building the dummy job and node from the config."""
+    job, node = config.build_dummy("12345")
+    assert job.id == "12345"
+    assert job.starttime == datetime(2025, 7, 9, 12, 0, 0, tzinfo=UTC)
+    assert job.cputime == 192.0
+    assert job.node == "dummy_node"
+    assert node.name == "dummy_node"
+    assert node.per_core_power_watts == 3.52
+    assert node.per_gpu_power_watts == 295.0
+    assert node.per_gb_power_watts == 0.3725
+
+    # The node is only constructed once
+    assert config.build_dummy("67890")[1] is node
+
+
+def test_dummy_job_start_time(config) -> None:
+    """Test that ISO format start times are parsed, and datetimes passed through."""
+    assert config.dummy_job.start_time == datetime(2025, 7, 9, 12, tzinfo=UTC)
+
+    data = config.dummy_job.model_dump()
+    assert DummyJob.model_validate(data) == config.dummy_job
+
+    data["start_time"] = "not a time"
+    with pytest.raises(ValueError):
+        DummyJob.model_validate(data)
+
+
+def test_dummy_job_empty_gpu_type(config) -> None:
+    """Test that an empty GPU type is treated as no GPU."""
+    data = config.dummy_job.model_dump() | {"ngpus": 0, "gpu_type": ""}
+    config = config.model_copy(update={"dummy_job": DummyJob.model_validate(data)})
+    assert config.dummy_job.gpu_type is None
+
+    _, node = config.build_dummy("12345")
+    assert node.gpu_type is None
+    assert node.per_gpu_power_watts == 0.0
+
+
+def test_component_powers(config) -> None:
+    """Test looking up the power usage of each component type."""
+    assert config.cpu_power("rome") == 3.52
+    assert config.gpu_power("RTX6000") == 295.0
+    assert config.gpu_power(None) == 0.0
+    assert config.gpu_power("") == 0.0
+    assert config.mem_power("common") == 0.3725
+
+    with pytest.raises(ValueError):
+        config.cpu_power("icelake")
+    with pytest.raises(ValueError):
+        config.gpu_power("A100")
+    with pytest.raises(ValueError):
+        config.mem_power("hbm")
+
+
+def test_component_validation(config) -> None:
+    """Test that misspelled or negative component powers are rejected."""
+    data = config.model_dump()
+    data["cpus"]["rome"] = {"per_core_power_wats": 3.52}
+    with pytest.raises(ValueError):
+        ClusterConfig.model_validate(data)
+
+    data["cpus"]["rome"] = {"per_core_power_watts": -3.52}
+    with pytest.raises(ValueError):
+        ClusterConfig.model_validate(data)
+
+
+def test_component_powers_mapping(config) -> None:
+    """Test the component powers in the form taken by Node.fromPBS."""
+    assert config.component_powers == {
+        "cpus": {"rome": {"per_core_power_watts": 3.52}},
+        "gpus": {"RTX6000": {"per_gpu_power_watts": 295.0}},
+        "memory": {"common": {"per_gb_power_watts": 0.3725}},
+    }
+
+
+def test_cached_powers_not_stale(config) -> None:
+    """Test that cached power tables follow changes to the configuration."""
+    assert config.cpu_power("rome") == 3.52
+    assert "rome" in config.component_powers["cpus"]
+    with pytest.raises(ValidationError):
+        config.cpus = {}
+
+    updated = config.model_copy(update={"cpus": {"milan": CPUConfig(4.0)}})
+    assert updated.cpu_power("milan") == 4.0
+    assert list(updated.component_powers["cpus"]) == ["milan"]
+    with pytest.raises(ValueError):
+        updated.cpu_power("rome")
+    assert config.cpu_power("rome") == 3.52
+
+
+def test_from_trusted_dict(config) -> None:
+    """Test reconstructing a config from its dumped data."""
+    assert ClusterConfig.from_trusted_dict(config.model_dump()) == config
+    assert ClusterConfig.from_trusted_dict(config.model_dump(mode="json")) == config
+
+
+def test_build_dummy_missing() -> None:
+    """Test building the dummy job when none is configured."""
+    config = ClusterConfig(cluster_name="Cluster", pue=1.3, cpus={}, gpus={}, memory={})
+    with pytest.raises(ValueError):
+        config.build_dummy("12345")
+
+
+def test_compile_yaml_to_json(tmp_path) -> None:
+    """Test that a compiled JSON config matches the YAML it was compiled from."""
+    src = Path(__file__).parent.parent / "clusters" / "dummy.yaml"
+    dst = compile_yaml_to_json(src, tmp_path / "dummy.json")
+    assert ClusterConfig.load(dst) == ClusterConfig.load(src)
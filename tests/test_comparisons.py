@@ -0,0 +1,119 @@
+"""Unit tests for the emissions comparison classes."""
+
+from pathlib import Path
+
+import pytest
+
+from carbon.comparisons import ComparisonDataError, Food, Travel, _load_csv
+
+
+@pytest.fixture
+def travel_path(tmp_path) -> Path:
+    """Fixture for a travel comparisons data file."""
+    path = tmp_path / "travel.csv"
+    path.write_text(
+        "Method,gCO2ePerKm,Note\n"
+        'Driving,200,""\n'
+        'Travelling by train,40,"(per passenger)"\n'
+    )
+    return path
+
+
+@pytest.fixture
+def food_path(tmp_path) -> Path:
+    """Fixture for a food comparisons data file."""
+    path = tmp_path / "food.csv"
+    path.write_text(
+        "Food,gCO2ePerKilo,PortionPerKilo,PluralPortionName\n"
+        "beef,60000,10,servings\n"
+        "bananas,800,5,\n"
+    )
+    return path
+
+
+def test_travel_equivalents(travel_path) -> None:
+    """Test the distance travelled for the same emissions."""
+    assert Travel(travel_path).get_equivalents(1000.0) == [
+        ("Driving", 5.0, ""),
+        ("Travelling by train", 25.0, "(per passenger)"),
+    ]
+
+
+def test_iter_equivalents(travel_path) -> None:
+    """Test iterating over the distances without building a list."""
+    equivalents = Travel(travel_path).iter_equivalents(1000.0)
+    assert next(equivalents) == ("Driving", 5.0, "")
+    assert list(equivalents) == [("Travelling by train", 25.0, "(per passenger)")]
+
+
+def test_food_equivalents(food_path) -> None:
+    """Test the portions of food eaten for the same emissions."""
+    assert Food(food_path).get_equivalents(1200.0) == [
+        ("beef", pytest.approx(0.2), "servings"),
+        ("bananas", pytest.approx(7.5), ""),
+    ]
+
+
+def test_skip_malformed_rows(food_path) -> None:
+    """Test that rows with missing or non-numeric values are skipped on loading."""
+    with food_path.open("a") as f:
+        f.write("lentils,unknown,10,servings\ntofu,3000\n")
+    assert [food for food, _, _ in Food(food_path).get_equivalents(1200.0)] == [
+        "beef",
+        "bananas",
+    ]
+
+
+def test_missing_columns(tmp_path) -> None:
+    """Test that a data file without the expected columns is rejected."""
+    path = tmp_path / "travel.csv"
+    path.write_text("Method,Note\nDriving,\n")
+    with pytest.raises(ComparisonDataError):
+        Travel(path)
+
+
+def test_print_comparisons(food_path, capsys) -> None:
+    """Test printing the food comparisons."""
+    Food(food_path).print_comparisons(1200.0)
+    assert capsys.readouterr().out == (
+        "Equivalent to:\n    0.2 servings of beef\n    7.5 bananas\n"
+    )
+
+
+def test_load_once(food_path, mocker) -> None:
+    """Test that each data file is only read once per process."""
+    food = Food(food_path)
+    open_ = mocker.patch("builtins.open")
+    assert Food(food_path).comparisons is food.comparisons
+    open_.assert_not_called()
+    assert not food.comparisons.per_gco2e.flags.writeable
+
+
+def test_print_travel_comparisons(travel_path, capsys) -> None:
+    """Test printing the travel comparisons."""
+    Travel(travel_path).print_comparisons(1000.0)
+    assert capsys.readouterr().out == (
+        "Equivalent to:\n"
+        "    Driving 5.0 km \n"
+        "    Travelling by train 25.0 km (per passenger)\n"
+    )
+
+
+def test_from_path(travel_path, cache_dir, mocker) -> None:
+    """Test that loaded comparison data is cached in the user's cache directory."""
+    travel = Travel.from_path(travel_path)
+    assert len(list((cache_dir / "comparisons").glob("*.json"))) == 1
+    assert [path.name for path in travel_path.parent.glob("travel.*")] == ["travel.csv"]
+
+    load = mocker.patch.object(Travel, "_load_comparisons")
+    cached = Travel.from_path(travel_path)
+    load.assert_not_called()
+    assert cached.get_equivalents(1000.0) == travel.get_equivalents(1000.0)
+    assert not cached.comparisons.per_gco2e.flags.writeable
+
+    # Modifying the CSV file invalidates the cache
+    mocker.stopall()
+    _load_csv.cache_clear()
+    with travel_path.open("a") as f:
+        f.write("Flying,250,\n")
+    assert len(Travel.from_path(travel_path).get_equivalents(1000.0)) == 3
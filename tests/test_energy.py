@@ -0,0 +1,78 @@
+"""Unit tests for the batch energy calculation."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from carbon import energy
+from carbon.energy import _energy_kernel, _energy_kernel_parallel, calculate_energies
+from carbon.job import Job
+from carbon.node import Node
+
+
+@pytest.mark.parametrize("parallel_min_jobs", [0, 10_000])
+def test_calculate_energies(parallel_min_jobs, monkeypatch) -> None:
+    """Test that batch energies match the per-job calculation."""
+    monkeypatch.setattr(energy, "_PARALLEL_MIN_JOBS", parallel_min_jobs)
+    jobs = [
+        Job("1", datetime(2025, 8, 21, 10, 0, 0), 2.0, 2.0, 1, 16.0, "node01"),
+        Job("2", datetime(2025, 8, 21, 11, 0, 0), 3.0, 12.0, 0, 64.0, "node02"),
+    ]
+    nodes = [
+        Node("node01", "test_cpu", "test_gpu", "test_mem", 10.0, 200.0, 2.0),
+        Node("node02", "test_cpu", None, "test_mem", 5.0, 0.0, 0.5),
+    ]
+
+    result = calculate_energies(
+        cputime=[job.cputime for job in jobs],
+        runtime=[job.runtime for job in jobs],
+        memory=[job.memory for job in jobs],
+        ngpus=[job.ngpus for job in jobs],
+        per_core_kw=[node._per_core_kw for node in nodes],
+        per_gpu_kw=[node._per_gpu_kw for node in nodes],
+        per_gb_kw=[node._per_gb_kw for node in nodes],
+        pue=1.5,
+    )
+
+    expected = [job.calculate_energy(node, 1.5) for job, node in zip(jobs, nodes)]
+    assert np.allclose(result, expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("parallel_min_jobs", [0, 10_000])
+def test_calculate_energies_mismatched(parallel_min_jobs, monkeypatch) -> None:
+    """Test that arrays of different lengths are rejected on either path."""
+    monkeypatch.setattr(energy, "HAVE_NUMBA", True)
+    monkeypatch.setattr(energy, "_PARALLEL_MIN_JOBS", parallel_min_jobs)
+    ones = np.ones(3)
+    with pytest.raises(ValueError):
+        calculate_energies(ones, ones, ones, ones, ones, ones, ones[:2], pue=1.5)
+    with pytest.raises(ValueError):
+        calculate_energies(ones, ones, ones[:1], ones, ones, ones, ones, pue=1.5)
+
+
+def test_energy_kernel_numpy() -> None:
+    """Test the uncompiled NumPy kernel used when Numba is not installed."""
+    ones = np.ones(3)
+    result = _energy_kernel(
+        np.array([1.0, 2.0, 3.0]), ones, ones, ones, ones, ones * 0.5, ones * 0.25, 2.0
+    )
+    assert np.allclose(result, [3.5, 5.5, 7.5])
+
+
+def test_energy_kernel_parallel() -> None:
+    """Test that the fused parallel kernel matches the NumPy kernel."""
+    rng = np.random.default_rng(0)
+    cputime, runtime, memory, ngpus, per_core_kw, per_gpu_kw, per_gb_kw = rng.random(
+        (7, 1000)
+    )
+    out = np.empty(1000)
+    _energy_kernel_parallel(
+        cputime, runtime, memory, ngpus, per_core_kw, per_gpu_kw, per_gb_kw, 1.3, out
+    )
+    assert np.allclose(
+        out,
+        _energy_kernel(
+            cputime, runtime, memory, ngpus, per_core_kw, per_gpu_kw, per_gb_kw, 1.3
+        ),
+    )
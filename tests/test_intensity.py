@@ -1,10 +1,15 @@
 """Unit tests for the CarbonIntensity class."""
 
-from datetime import datetime
+import asyncio
+import json
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
 
+from carbon import intensity
 from carbon.intensity import CarbonIntensity
 
 
@@ -21,15 +26,125 @@ def mock_response() -> Mock:
     """Fixture for a mocked API response object."""
     response = Mock()
     response.status_code = 200
-    response.json.return_value = {
-        "data": {"data": [{"intensity": {"forecast": 120.0}}]}
-    }
+    response.content = json_body(
+        [{"from": "2025-08-21T12:00Z", "intensity": {"forecast": 120.0}}]
+    )
     return response
 
 
+def json_body(periods: list[dict[str, object]]) -> bytes:
+    """Encode carbon intensity periods as the body of an API response."""
+    return json.dumps({"data": {"data": periods}}).encode()
+
+
 def test_carbon_intensity_fetch(mock_response) -> None:
     """Test CarbonIntensity.fetch() with mocked API response."""
-    with patch("requests.get", return_value=mock_response):
+    with patch.object(intensity._SESSION, "get", return_value=mock_response) as get:
         dt = datetime(2025, 8, 21, 12, 0, 0)
         ci = CarbonIntensity(dt)
         assert ci.fetch() == 120.0
+        assert ci.fetch() == 120.0
+    assert get.call_count == 2
+    assert get.call_args.kwargs["timeout"] == intensity._TIMEOUT
+    assert intensity._SESSION.headers["Accept"] == "application/json"
+
+
+def test_session_retries() -> None:
+    """Test that the shared session retries transient failures."""
+    adapter = intensity._SESSION.get_adapter("https://api.carbonintensity.org.uk")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.max_retries.total == 3
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_carbon_intensity_fetch_actual(mock_response) -> None:
+    """Test that the actual carbon intensity is preferred to the forecast."""
+    mock_response.content = json_body(
+        [
+            {
+                "from": "2025-08-21T12:00Z",
+                "intensity": {"forecast": 120.0, "actual": 110.0},
+            }
+        ]
+    )
+    with patch.object(intensity._SESSION, "get", return_value=mock_response):
+        assert CarbonIntensity(datetime(2025, 8, 21, 12)).fetch() == 110.0
+
+
+def test_carbon_intensity_fetch_session(mock_response) -> None:
+    """Test CarbonIntensity.fetch() with a given session."""
+    session = Mock()
+    session.get.return_value = mock_response
+    assert CarbonIntensity(datetime(2025, 8, 21, 12)).fetch(session) == 120.0
+    session.get.assert_called_once()
+
+
+def test_carbon_intensity_fetch_missing(mock_response) -> None:
+    """Test that a response without data for the period is an error."""
+    with patch.object(intensity._SESSION, "get", return_value=mock_response):
+        with pytest.raises(ValueError):
+            CarbonIntensity(datetime(2025, 8, 21, 13)).fetch()
+
+
+def test_carbon_intensity_fetch_error(mock_response) -> None:
+    """Test that an error status from the API is raised as a ValueError."""
+    mock_response.status_code = 503
+    mock_response.text = "Service Unavailable"
+    mock_response.raise_for_status.side_effect = requests.HTTPError("503")
+    with patch.object(intensity._SESSION, "get", return_value=mock_response):
+        with pytest.raises(ValueError, match="503 Service Unavailable"):
+            CarbonIntensity(datetime(2025, 8, 21, 12)).fetch()
+
+
+def test_carbon_intensity_fetch_range(mock_response) -> None:
+    """Test fetching every period in a time range with one request."""
+    mock_response.content = json_body(
+        [
+            {"from": "2025-08-21T12:00Z", "intensity": {"forecast": 120.0}},
+            {"from": "2025-08-21T12:30Z", "intensity": {"forecast": 130.0}},
+        ]
+    )
+    with patch.object(intensity._SESSION, "get", return_value=mock_response) as get:
+        assert CarbonIntensity.fetch_range(
+            datetime(2025, 8, 21, 12), datetime(2025, 8, 21, 13)
+        ) == {"2025-08-21T12:00Z": 120.0, "2025-08-21T12:30Z": 130.0}
+    assert get.call_args.args[0].endswith(
+        "/2025-08-21T12:00Z/2025-08-21T13:00Z/regionid/13"
+    )
+
+
+def test_carbon_intensity_fetch_many(mocker) -> None:
+    """Test that nearby periods are fetched together, and each only once."""
+
+    def fetch_range(start, end, session):
+        periods = (end - start) // timedelta(minutes=30)
+        return {
+            (start + i * timedelta(minutes=30)).strftime("%Y-%m-%dT%H:%MZ"): float(i)
+            for i in range(periods)
+        }
+
+    mock_fetch_range = mocker.patch.object(
+        CarbonIntensity, "fetch_range", side_effect=fetch_range
+    )
+    times = [
+        datetime(2025, 8, 21, 13, 10),
+        datetime(2025, 8, 21, 12, 0),
+        datetime(2025, 8, 21, 12, 20),
+        datetime(2025, 9, 21, 12, 0),
+    ]
+    assert CarbonIntensity.fetch_many(times) == [2.0, 0.0, 0.0, 0.0]
+    assert sorted(call.args[:2] for call in mock_fetch_range.call_args_list) == [
+        (datetime(2025, 8, 21, 12), datetime(2025, 8, 21, 13, 30)),
+        (datetime(2025, 9, 21, 12), datetime(2025, 9, 21, 12, 30)),
+    ]
+
+
+def test_carbon_intensity_fetch_many_async(mocker) -> None:
+    """Test awaiting a batch of carbon intensity lookups."""
+    fetch_many = mocker.patch.object(
+        CarbonIntensity, "fetch_many", return_value=[100.0, 110.0]
+    )
+    times = (datetime(2025, 8, 21, 12), datetime(2025, 8, 21, 13))
+    result = asyncio.run(CarbonIntensity.fetch_many_async(times))
+    assert result == [100.0, 110.0]
+    fetch_many.assert_called_once_with(list(times), None)
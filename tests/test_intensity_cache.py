@@ -0,0 +1,73 @@
+"""Unit tests for the IntensityCache class."""
+
+import time
+
+from carbon._intensity_cache import FORECAST_TTL, IntensityCache
+
+KEY = (13, "2025-08-21T12:00:00")
+OTHER_KEY = (13, "2025-08-21T12:30:00")
+
+
+def test_get_put() -> None:
+    """Test caching values for finished and forecast periods."""
+    cache = IntensityCache()
+    assert cache.get(KEY) is None
+
+    cache.put(KEY, 120.0, final=True)
+    cache.put(OTHER_KEY, 130.0, final=False)
+    assert cache.get(KEY) == 120.0
+    assert cache.get(OTHER_KEY) == 130.0
+    assert cache.get((12, KEY[1])) is None
+
+
+def test_forecast_expiry(mocker) -> None:
+    """Test that forecasts expire while values for finished periods do not."""
+    cache = IntensityCache()
+    cache.put(KEY, 120.0, final=True)
+    cache.put(OTHER_KEY, 130.0, final=False)
+
+    mocker.patch("time.time", return_value=time.time() + FORECAST_TTL + 1)
+    assert cache.get(KEY) == 120.0
+    assert cache.get(OTHER_KEY) is None
+    assert len(cache) == 1
+
+
+def test_eviction() -> None:
+    """Test that the least recently used value is evicted when full."""
+    cache = IntensityCache(max_entries=2)
+    cache.put(KEY, 120.0, final=True)
+    cache.put(OTHER_KEY, 130.0, final=True)
+    cache.get(KEY)
+    cache.put((13, "2025-08-21T13:00:00"), 140.0, final=True)
+    assert cache.get(KEY) == 120.0
+    assert cache.get(OTHER_KEY) is None
+
+
+def test_save_load(tmp_path, mocker) -> None:
+    """Test persisting the cache, dropping expired forecasts on loading."""
+    path = tmp_path / "cache" / "intensity.json"
+    cache = IntensityCache()
+    cache.put(KEY, 120.0, final=True)
+    cache.put(OTHER_KEY, 130.0, final=False)
+    cache.save(path)
+
+    loaded = IntensityCache()
+    loaded.load(path)
+    assert loaded.get(KEY) == 120.0
+    assert loaded.get(OTHER_KEY) == 130.0
+
+    mocker.patch("time.time", return_value=time.time() + FORECAST_TTL + 1)
+    loaded = IntensityCache()
+    loaded.load(path)
+    assert len(loaded) == 1
+
+
+def test_load_malformed(tmp_path) -> None:
+    """Test that a missing or malformed cache file is treated as empty."""
+    cache = IntensityCache()
+    cache.load(tmp_path / "missing.json")
+
+    path = tmp_path / "intensity.json"
+    path.write_text("{not json")
+    cache.load(path)
+    assert len(cache) == 0
@@ -1,10 +1,21 @@
 """Unit tests for the Job class and hours conversion."""
 
+import json
+import subprocess
+from dataclasses import FrozenInstanceError
 from datetime import datetime
+from unittest.mock import Mock
 
 import numpy as np
+import pytest
 
-from carbon.job import Job, hours
+from carbon.job import (
+    Job,
+    MalformedJobIDError,
+    UnknownJobIDError,
+    _memory_gb,
+    hours,
+)
 from carbon.node import Node
 
 
@@ -15,6 +26,17 @@ def test_hours_conversion() -> None:
     assert hours("10:00:00") == 10.0
 
 
+def test_memory_conversion() -> None:
+    """Test conversion of PBS memory amounts to gigabytes."""
+    assert _memory_gb("16gb") == 16.0
+    assert _memory_gb("2tb") == 2048.0
+    assert _memory_gb("1048576kb") == 1.0
+    with pytest.raises(NotImplementedError):
+        _memory_gb("16")
+    with pytest.raises(NotImplementedError):
+        _memory_gb("16GB")
+
+
 def test_job_init() -> None:
     """Test Job initialization."""
     job = Job(
@@ -33,6 +55,9 @@ def test_job_init() -> None:
     assert job.ngpus == 2
     assert job.memory == 32.0
     assert job.node == "node01"
+    assert not hasattr(job, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        job.memory = 64.0  # type: ignore[misc]
 
 
 def test_energy_calculate() -> None:
@@ -87,3 +112,124 @@ def test_energy_calculate_no_gpu() -> None:
     result = job.calculate_energy(node, 1.5)
 
     assert np.isclose(result, expected, atol=1e-9)
+
+
+def test_energy_calculate_many() -> None:
+    """Test that batch energy calculation matches calculating each job's energy."""
+    jobs = [
+        Job(
+            id=str(i),
+            starttime=datetime(2025, 8, 21, 10, 0, 0),
+            runtime=2.0 + i,
+            cputime=4.0 * i,
+            ngpus=i % 2,
+            memory=16.0,
+            node=f"node{i % 2}",
+        )
+        for i in range(4)
+    ]
+    nodes = [
+        Node(
+            name=job.node,
+            cpu_type="test_cpu",
+            gpu_type="test_gpu" if job.ngpus else None,
+            mem_type="test_mem",
+            per_core_power_watts=10.0,
+            per_gpu_power_watts=200.0 * job.ngpus,
+            per_gb_power_watts=2.0,
+        )
+        for job in jobs
+    ]
+
+    result = Job.calculate_energies(jobs, nodes, 1.5)
+    expected = [job.calculate_energy(node, 1.5) for job, node in zip(jobs, nodes)]
+    assert np.allclose(result, expected, atol=1e-9)
+
+    with pytest.raises(ValueError):
+        Job.calculate_energies(jobs, nodes[:2], 1.5)
+
+
+def qstat_output(mocker, jobs: dict[str, object], returncode: int = 0) -> Mock:
+    """Mock the output of ``qstat -xfF json`` for the given job entries."""
+    output = json.dumps({"Jobs": jobs}).encode() if jobs else b""
+    return mocker.patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(
+            args="qstat", returncode=returncode, stdout=output, stderr=b""
+        ),
+    )
+
+
+QSTAT_JOB = {
+    "job_state": "F",
+    "exec_host": "node01/0*8",
+    "stime": "Thu Aug 21 10:00:00 2025",
+    "resources_used": {"walltime": "02:00:00", "cput": "04:00:00"},
+    "Resource_List": {"mem": "32gb", "ngpus": 2},
+}
+
+
+def test_job_from_pbs_many(mocker) -> None:
+    """Test fetching several jobs with one qstat command."""
+    mocker.patch.dict(Job._snapshot, clear=True)
+    run = qstat_output(mocker, {"2.pbs": QSTAT_JOB, "1.pbs": QSTAT_JOB})
+    jobs = Job.fromPBS_many(["1", "2"])
+    assert [job.id for job in jobs] == ["1.pbs", "2.pbs"]
+    assert jobs[0].starttime == datetime(2025, 8, 21, 10)
+    assert jobs[0].runtime == 2.0
+    assert jobs[0].memory == 32.0
+    assert jobs[0].ngpus == 2
+    assert jobs[0].node == "node01"
+    run.assert_called_once()
+    assert run.call_args.args[0] == ["qstat", "-xfF", "json", "1", "2"]
+
+    # Recently fetched jobs are reused
+    assert Job.fromPBS("2") is jobs[1]
+    run.assert_called_once()
+
+
+def test_job_snapshot_expiry(mocker) -> None:
+    """Test that expired jobs are removed from the snapshot on the next fetch."""
+    mocker.patch.dict(Job._snapshot, clear=True)
+    monotonic = mocker.patch("time.monotonic", return_value=1000.0)
+    qstat_output(mocker, {"1.pbs": QSTAT_JOB})
+    Job.fromPBS_many(["1"])
+    assert set(Job._snapshot) == {"1"}
+
+    monotonic.return_value += 30.0
+    qstat_output(mocker, {"2.pbs": QSTAT_JOB})
+    Job.fromPBS_many(["2"])
+    assert set(Job._snapshot) == {"1", "2"}
+
+    monotonic.return_value += 30.0
+    qstat_output(mocker, {"3.pbs": QSTAT_JOB})
+    Job.fromPBS_many(["3"])
+    assert set(Job._snapshot) == {"2", "3"}
+
+
+def test_job_from_pbs_many_unknown(mocker) -> None:
+    """Test that a job unknown to PBS is an error, even if others are known."""
+    mocker.patch.dict(Job._snapshot, clear=True)
+    qstat_output(mocker, {"1.pbs": QSTAT_JOB}, returncode=153)
+    with pytest.raises(UnknownJobIDError):
+        Job.fromPBS_many(["1", "2"])
+    with pytest.raises(MalformedJobIDError):
+        Job.fromPBS_many(["1", "2x"])
+
+
+def test_job_from_pbs_many_fallback(mocker) -> None:
+    """Test that jobs missing from a batch are fetched individually."""
+    mocker.patch.dict(Job._snapshot, clear=True)
+
+    def qstat(args, **kwargs):
+        ids = args[3:]
+        if len(ids) > 1:
+            # Reject the whole batch
+            return subprocess.CompletedProcess(args, 2, stdout=b"", stderr=b"")
+        stdout = json.dumps({"Jobs": {f"{ids[0]}.pbs": QSTAT_JOB}}).encode()
+        return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr=b"")
+
+    run = mocker.patch("subprocess.run", side_effect=qstat)
+    jobs = Job.fromPBS_many(["1", "2[3]", "1"])
+    assert [job.id for job in jobs] == ["1.pbs", "2[3].pbs", "1.pbs"]
+    assert run.call_count == 3
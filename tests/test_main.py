@@ -0,0 +1,33 @@
+"""Tests for the command line interface."""
+
+import shutil
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from carbon.__main__ import main
+
+DUMMY_CONFIG = Path(__file__).parent.parent / "clusters" / "dummy.yaml"
+
+
+def test_main(tmp_path) -> None:
+    """Test estimating the emissions of the dummy job."""
+    config_path = tmp_path / "dummy.yaml"
+    shutil.copy(DUMMY_CONFIG, config_path)
+
+    result = CliRunner().invoke(
+        main,
+        ["--verbose", "--default_intensity", "--config_path", str(config_path), "1"],
+    )
+    assert result.exit_code == 0
+    assert "Name: DummyCluster" in result.output
+    assert "is 10.22 kWh" in result.output
+    assert "Estimated emissions is 1400 gCO2e" in result.output
+
+
+def test_main_missing_config(monkeypatch) -> None:
+    """Test that a missing config path is reported."""
+    monkeypatch.delenv("CARBON_CONFIG", raising=False)
+    result = CliRunner().invoke(main, ["1"])
+    assert result.exit_code == 1
+    assert "Missing CARBON_CONFIG" in result.output
@@ -1,7 +1,16 @@
 """Unit tests for the Node class."""
 
+import subprocess
+
+from carbon import node as node_module
 from carbon.node import Node
 
+COMPONENT_POWERS = {
+    "cpus": {"rome": {"per_core_power_watts": 3.52}},
+    "gpus": {"A100": {"per_gpu_power_watts": 250.0}},
+    "memory": {"common": {"per_gb_power_watts": 0.3725}},
+}
+
 
 def test_node_init() -> None:
     """Test Node initialization with GPU."""
@@ -36,3 +45,68 @@ def test_node_init_no_gpu() -> None:
     )
     assert node.gpu_type is None
     assert node.per_gpu_power_watts == 0.0
+
+
+def test_node_power_kw() -> None:
+    """Test that component powers are precomputed in kilowatts."""
+    node = Node(
+        name="node01",
+        cpu_type="Intel-Xeon",
+        gpu_type="NVIDIA-A100",
+        mem_type="common",
+        per_core_power_watts=12.5,
+        per_gpu_power_watts=250.0,
+        per_gb_power_watts=3.0,
+    )
+    assert node._per_core_kw == 0.0125
+    assert node._per_gpu_kw == 0.25
+    assert node._per_gb_kw == 0.003
+
+
+def test_node_from_pbs_cached(mocker) -> None:
+    """Test that each node's hardware is only fetched from PBS once."""
+    node_module._query_pbs_node.cache_clear()
+    run = mocker.patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(
+            args="qmgr",
+            returncode=0,
+            stdout="    resources_available.cpu_type = rome\n"
+            "    resources_available.gpu_type = A100\n",
+        ),
+    )
+    node = Node.fromPBS("node01", COMPONENT_POWERS)
+    assert node.cpu_type == "rome"
+    assert node.gpu_type == "A100"
+    assert node.per_gpu_power_watts == 250.0
+    assert Node.fromPBS("node01", COMPONENT_POWERS) == node
+    run.assert_called_once()
+    assert run.call_args.args[0] == ["qmgr", "-c", "list node node01"]
+    node_module._query_pbs_node.cache_clear()
+
+
+def test_node_from_pbs_many(mocker) -> None:
+    """Test that many nodes are listed with one qmgr command."""
+    node_module._query_all_pbs_nodes.cache_clear()
+    node_module._query_pbs_node.cache_clear()
+    run = mocker.patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(
+            args="qmgr",
+            returncode=0,
+            stdout="Node node01\n"
+            "    resources_available.cpu_type = rome\n"
+            "    resources_available.gpu_type = None\n"
+            "\n"
+            "Node node02\n"
+            "    resources_available.cpu_type = rome\n"
+            "    resources_available.gpu_type = A100\n",
+        ),
+    )
+    nodes = Node.fromPBS_many(["node02", "node01", "node02"], COMPONENT_POWERS)
+    assert [node.name for node in nodes] == ["node02", "node01", "node02"]
+    assert [node.gpu_type for node in nodes] == ["A100", None, "A100"]
+    assert nodes[0] is nodes[2]
+    run.assert_called_once()
+    assert run.call_args.args[0] == ["qmgr", "-c", "list node @default"]
+    node_module._query_all_pbs_nodes.cache_clear()
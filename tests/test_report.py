@@ -0,0 +1,71 @@
+"""Unit tests for the report module."""
+
+from datetime import datetime
+
+import pytest
+
+from carbon import RunResult
+from carbon.clusterconfig import ClusterConfig
+from carbon.job import Job
+from carbon.node import Node
+from carbon.report import format_verbose
+
+
+def _result() -> RunResult:
+    node = Node(
+        name="node01",
+        cpu_type="test_cpu",
+        gpu_type=None,
+        mem_type="test_mem",
+        per_core_power_watts=10.0,
+        per_gpu_power_watts=0.0,
+        per_gb_power_watts=2.0,
+    )
+    job = Job("12345", datetime(2025, 8, 21, 10, 0, 0), 2.0, 2.0, 0, 16.0, "node01")
+    return RunResult(
+        job=job,
+        node=node,
+        energy_consumed=0.156,
+        carbon_intensity=100.0,
+        emissions=15.6,
+    )
+
+
+def test_format_verbose() -> None:
+    """Test the verbose description of a job's cluster and node."""
+    config = ClusterConfig(
+        cluster_name="TestCluster", pue=1.5, cpus={}, gpus={}, memory={}
+    )
+
+    lines = format_verbose(_result(), config).splitlines()
+    assert lines[0] == "Cluster information:"
+    assert "    Name: TestCluster" in lines
+    assert "    PUE: 1.5" in lines
+    assert "    Name: node01" in lines
+    assert "    GPU model: None" in lines
+    assert "    CPU power draw (per core): 10.0 W" in lines
+
+
+@pytest.mark.parametrize(
+    ("assume_renewable", "expected", "unexpected"),
+    [
+        (False, "London average", "100% renewable, so"),
+        (True, "100% renewable, so", "London average"),
+    ],
+)
+def test_format_verbose_intensity_note(
+    assume_renewable: bool, expected: str, unexpected: str
+) -> None:
+    """Test the calculation note matches how the carbon intensity was chosen."""
+    config = ClusterConfig(
+        cluster_name="TestCluster",
+        pue=1.5,
+        cpus={},
+        gpus={},
+        memory={},
+        assume_renewable=assume_renewable,
+    )
+
+    text = format_verbose(_result(), config)
+    assert expected in text
+    assert unexpected not in text